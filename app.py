@@ -1,367 +1,44 @@
-import os
+import logging
+import queue
 import threading
 import time
 import tkinter as tk
-from contextlib import contextmanager
-from dataclasses import dataclass
-from datetime import date, datetime
-from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext
-from typing import List, Optional
-
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
-
-@dataclass
-class Config:
-    BASE_URL = "http://192.168.1.248/"
-    START_URL = BASE_URL + "Uretim/UrunNerede"
-    WAIT_TIMEOUT: int = 10
-    PAGE_LOAD_DELAY: int = 15
-    SEARCH_DELAY: int = 2
-    CLICK_DELAY: int = 1
-    UPDATE_DELAY: int = 2
-    MAX_RETRIES: int = 3
-    ERROR_FILE: str = "error_urunler.txt"
-
-    ERROR_KEYWORDS: List[str] = None
-
-    def __post_init__(self):
-        if self.ERROR_KEYWORDS is None:
-            self.ERROR_KEYWORDS = [
-                "subquery returned more than 1 value",
-                "nesne başvurusu bir nesnenin örneğine ayarlanmadı",
-                "sunucu hatası",
-                "system.nullreferenceexception",
-                "server error",
-                "geçerli web isteği yürütülürken işlenmemiş özel durum",
-            ]
-
-
-def get_chrome_options() -> Options:
-    options = Options()
-    options.add_argument("--log-level=3")
-    options.add_argument("--disable-logging")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--no-sandbox")
-    options.add_experimental_option(
-        "excludeSwitches", ["enable-logging", "enable-automation"]
-    )
-    options.add_experimental_option("useAutomationExtension", False)
-    return options
-
-
-service = Service(log_path=os.devnull)
-config = Config()
-
-
-class DateRangeFilter:
-
-    @staticmethod
-    def parse_date(date_str: str) -> Optional[date]:
-        try:
-            return datetime.strptime(date_str.strip(), "%d.%m.%Y").date()
-        except ValueError:
-            return None
-
-    @staticmethod
-    def parse_date_range(
-        start_date_str: str, end_date_str: str
-    ) -> tuple[Optional[date], Optional[date]]:
-        start_date = (
-            DateRangeFilter.parse_date(start_date_str)
-            if start_date_str.strip()
-            else None
-        )
-        end_date = (
-            DateRangeFilter.parse_date(end_date_str) if end_date_str.strip() else None
-        )
-        return start_date, end_date
-
-    @staticmethod
-    def is_date_in_range(
-        order_date_str: str, start_date: Optional[date], end_date: Optional[date]
-    ) -> bool:
-        try:
-            order_date = DateRangeFilter.parse_date(order_date_str)
-            if order_date is None:
-                return False
-
-            if start_date and end_date:
-                return start_date <= order_date <= end_date
-            elif start_date:
-                return order_date >= start_date
-            elif end_date:
-                return order_date <= end_date
-            else:
-                return True
-
-        except Exception:
-            return False
-
-
-class FileProcessor:
-
-    @staticmethod
-    def read_txt_file(file_path: str) -> List[str]:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return [line.strip() for line in f if line.strip()]
-
-    @staticmethod
-    def read_xlsx_file(file_path: str) -> List[str]:
-        import openpyxl
-
-        wb = openpyxl.load_workbook(file_path)
-        ws = wb.active
-        return [str(cell.value).strip() for cell in ws["A"] if cell.value]
-
-    @staticmethod
-    def read_xls_file(file_path: str) -> List[str]:
-        import xlrd
-
-        wb = xlrd.open_workbook(file_path)
-        sheet = wb.sheet_by_index(0)
-        return [
-            str(sheet.cell_value(i, 0)).strip()
-            for i in range(sheet.nrows)
-            if sheet.cell_value(i, 0)
-        ]
-
-    @staticmethod
-    def read_xml_file(file_path: str) -> List[str]:
-        import xml.etree.ElementTree as ET
-
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        return [elem.text.strip() for elem in root.iter("kod") if elem.text]
-
-    @classmethod
-    def read_file(cls, file_path: str) -> List[str]:
-        file_extension = Path(file_path).suffix.lower()
-
-        processors = {
-            ".txt": cls.read_txt_file,
-            ".xlsx": cls.read_xlsx_file,
-            ".xls": cls.read_xls_file,
-            ".xml": cls.read_xml_file,
-        }
-
-        processor = processors.get(file_extension)
-        if not processor:
-            raise ValueError(f"Unsupported file format: {file_extension}")
-
-        return processor(file_path)
-
-
-class ErrorLogger:
-
-    def __init__(self, error_file: str = config.ERROR_FILE):
-        self.error_file = error_file
-
-    def log_error(self, product_code: str):
-        with open(self.error_file, "a", encoding="utf-8") as f:
-            f.write(f"{product_code}\n")
-
-
-class RowFilter:
-
-    @staticmethod
-    def should_process_row(
-        row, tds: List, date_range: tuple = None, status_filter: str = None
-    ) -> bool:
-        if len(tds) < 15:
-            return False
-
-        if date_range:
-            start_date, end_date = date_range
-            order_date_str = tds[14].text.strip()
-            if not DateRangeFilter.is_date_in_range(
-                order_date_str, start_date, end_date
-            ):
-                return False
-
-        if status_filter and len(tds) >= 7:
-            hazirlik = tds[6].text.strip()
-            if hazirlik.upper() != status_filter.upper():
-                return False
-
-        return True
-
-
-class WebDriverManager:
-
-    def __init__(self, config: Config):
-        self.config = config
-        self.driver: Optional[webdriver.Chrome] = None
-        self.wait: Optional[WebDriverWait] = None
-        self.error_logger = ErrorLogger()
-
-    @contextmanager
-    def create_driver(self):
-        try:
-            self.driver = webdriver.Chrome(
-                service=service, options=get_chrome_options()
-            )
-            self.wait = WebDriverWait(self.driver, self.config.WAIT_TIMEOUT)
-            yield self.driver
-        finally:
-            if self.driver:
-                self.driver.quit()
-
-    def navigate_to_start_page(self):
-        self.driver.get(self.config.START_URL)
-        time.sleep(self.config.PAGE_LOAD_DELAY)
-
-    def search_product(self, product_code: str) -> bool:
-        try:
-            search_input = self.wait.until(
-                EC.presence_of_element_located(
-                    (By.ID, "gridViewurnerede_DXFREditorcol4_I")
-                )
-            )
-            search_input.clear()
-            search_input.send_keys(product_code)
-
-            time.sleep(self.config.SEARCH_DELAY)
-            self.wait.until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, 'tr[id^="gridViewurnerede_DXDataRow"]')
-                )
-            )
-            return True
-
-        except TimeoutException:
-            return False
-
-    def has_error_page(self) -> bool:
-        page_text = self.driver.page_source.lower()
-        return any(err in page_text for err in self.config.ERROR_KEYWORDS)
-
-    def process_product_row(
-        self,
-        row,
-        row_index: int,
-        date_range: tuple = None,
-        status_filter: str = None,
-    ) -> bool:
-        try:
-            tds = row.find_elements(By.TAG_NAME, "td")
-            if len(tds) < 15:
-                return False
-
-            if not RowFilter.should_process_row(row, tds, date_range, status_filter):
-                if date_range:
-                    order_date = tds[14].text.strip()
-                    start_date, end_date = date_range
-                    if start_date and end_date:
-                        self.log(
-                            f"  Satır {row_index+1} tarih aralığı dışında ({order_date}), atlanıyor."
-                        )
-                    elif start_date:
-                        self.log(
-                            f"  Satır {row_index+1} başlangıç tarihinden önce ({order_date}), atlanıyor."
-                        )
-                    elif end_date:
-                        self.log(
-                            f"  Satır {row_index+1} bitiş tarihinden sonra ({order_date}), atlanıyor."
-                        )
-                elif status_filter:
-                    hazirlik = tds[6].text.strip() if len(tds) > 6 else "N/A"
-                    self.log(
-                        f"  Satır {row_index+1} durum filtrelendi ({hazirlik}), atlanıyor."
-                    )
-                return False
-
-            work_order = tds[2].text.strip()
-            link = tds[3].find_element(By.TAG_NAME, "a")
-
-            self.driver.execute_script("arguments[0].click();", link)
-            time.sleep(self.config.CLICK_DELAY)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-
-            if self.has_error_page():
-                self.error_logger.log_error(work_order)
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-                return False
-
-            success = self.process_product_page(work_order, row_index)
-
-            if len(self.driver.window_handles) > 1:
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-
-            return success
-
-        except Exception as e:
-            if len(self.driver.window_handles) > 1:
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-            return False
-
-    def process_product_page(self, work_order: str, row_index: int) -> bool:
-        try:
-            quantity_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "Miktar_I"))
-            )
-            quantity = quantity_input.get_attribute("value")
-
-            try:
-                start1 = self.wait.until(EC.element_to_be_clickable((By.ID, "Baslat")))
-                self.driver.execute_script("arguments[0].click();", start1)
-                time.sleep(self.config.CLICK_DELAY)
-
-                start2 = self.wait.until(
-                    EC.element_to_be_clickable((By.ID, "btnUpdatebaslat"))
-                )
-                self.driver.execute_script("arguments[0].click();", start2)
-                time.sleep(self.config.UPDATE_DELAY)
-            except TimeoutException:
-                pass
-
-            finish = self.wait.until(EC.element_to_be_clickable((By.ID, "Bitir")))
-            self.driver.execute_script("arguments[0].click();", finish)
-            time.sleep(self.config.CLICK_DELAY)
-
-            brut_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "Brut_I"))
-            )
-            brut_input.clear()
-            brut_input.send_keys(quantity)
-            time.sleep(self.config.CLICK_DELAY)
-
-            add_button = self.wait.until(
-                EC.element_to_be_clickable((By.ID, "btnUpdate_CD"))
-            )
-            self.driver.execute_script("arguments[0].click();", add_button)
-            time.sleep(self.config.UPDATE_DELAY)
-
-            return True
-
-        except TimeoutException:
-            self.error_logger.log_error(work_order)
-            return False
-        except Exception:
-            return False
+from typing import Dict, Optional
+
+from portal_core import (
+    BasePortalManager,
+    BatchRunner,
+    CheckpointJournal,
+    DateRangeFilter,
+    DiagnosticsSink,
+    ErrorLogger,
+    FileProcessor,
+    LogEvent,
+    RowCriteria,
+    RunOptions,
+    config,
+    close_sessions,
+    create_file_logger,
+)
 
 
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
+        self.log_queue: "queue.Queue[LogEvent]" = queue.Queue()
+        self.file_logger = create_file_logger()
         self.setup_ui()
-        self.driver_manager = WebDriverManager(config)
-        self.product_codes: List[str] = []
+        self.error_logger = ErrorLogger(
+            config.ERROR_FILE, DiagnosticsSink.from_config(config)
+        )
+        self.journal = CheckpointJournal()
+        self.sessions: Dict[str, BasePortalManager] = {}
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.runner: Optional[BatchRunner] = None
         self.selected_file: Optional[str] = None
         self.is_running = False
-        self.date_range = None
-        self.status_filter = None
+        self.after(config.LOG_POLL_MS, self.drain_log_queue)
 
     def setup_ui(self):
         self.title("Portal Cleaner - Ultimate")
@@ -431,11 +108,47 @@ class App(tk.Tk):
 
         status_input_frame = tk.Frame(self.status_frame)
         status_input_frame.pack(fill="x", pady=2)
-        tk.Label(status_input_frame, text="Durum (örn: HAZIRLIK):").pack(side="left")
+        tk.Label(
+            status_input_frame, text="Durum (virgülle ayırın, örn: HAZIRLIK, ÜRETİM):"
+        ).pack(side="left")
         self.status_entry = tk.Entry(status_input_frame, width=20)
         self.status_entry.pack(side="left", padx=(5, 0))
         self.status_entry.insert(0, "HAZIRLIK")
 
+        exclude_status_frame = tk.Frame(self.status_frame)
+        exclude_status_frame.pack(fill="x", pady=2)
+        tk.Label(exclude_status_frame, text="Hariç tutulacak durumlar:").pack(
+            side="left"
+        )
+        self.exclude_status_entry = tk.Entry(exclude_status_frame, width=20)
+        self.exclude_status_entry.pack(side="left", padx=(5, 0))
+
+        self.work_order_enabled = tk.BooleanVar(value=False)
+        work_order_check = tk.Checkbutton(
+            options_frame,
+            text="İş Emri Filtresi Kullan",
+            variable=self.work_order_enabled,
+            command=self.on_work_order_toggle,
+        )
+        work_order_check.pack(anchor="w", pady=2)
+
+        self.work_order_frame = tk.LabelFrame(
+            options_frame, text="İş Emri Filtresi", padx=10, pady=5
+        )
+
+        self.work_order_entries = {}
+        for key, label in (
+            ("prefix", "Önek (virgülle ayırın):"),
+            ("pattern", "Desen (regex):"),
+            ("exclude", "Hariç tutulacak iş emirleri:"),
+        ):
+            entry_frame = tk.Frame(self.work_order_frame)
+            entry_frame.pack(fill="x", pady=2)
+            tk.Label(entry_frame, text=label, width=24, anchor="w").pack(side="left")
+            entry = tk.Entry(entry_frame, width=30)
+            entry.pack(side="left", padx=(5, 0))
+            self.work_order_entries[key] = entry
+
         self.product_enabled = tk.BooleanVar(value=False)
         product_check = tk.Checkbutton(
             options_frame,
@@ -456,6 +169,80 @@ class App(tk.Tk):
         )
         self.select_file_button.pack(pady=5)
 
+        worker_frame = tk.Frame(self.product_frame)
+        worker_frame.pack(fill="x", pady=2)
+        tk.Label(worker_frame, text="Paralel tarayıcı sayısı:").pack(side="left")
+        self.worker_spinbox = tk.Spinbox(
+            worker_frame, from_=1, to=config.MAX_WORKER_COUNT, width=5
+        )
+        self.worker_spinbox.pack(side="left", padx=(5, 0))
+        self.worker_spinbox.delete(0, tk.END)
+        self.worker_spinbox.insert(0, str(config.WORKER_COUNT))
+
+        self.index_enabled = tk.BooleanVar(value=config.PRODUCT_CODE_INDEX)
+        tk.Checkbutton(
+            self.product_frame,
+            text="Önce tabloyu dizinle (kodları portalda tek tek aramadan bul)",
+            variable=self.index_enabled,
+        ).pack(anchor="w", pady=2)
+
+        queue_frame = tk.Frame(self.product_frame)
+        queue_frame.pack(fill="x", pady=2)
+        self.queue_enabled = tk.BooleanVar(value=bool(config.QUEUE_FILE))
+        tk.Checkbutton(
+            queue_frame,
+            text="Paylaşımlı kuyruk (birden çok bilgisayar):",
+            variable=self.queue_enabled,
+        ).pack(side="left")
+        self.queue_entry = tk.Entry(queue_frame, width=30)
+        self.queue_entry.pack(side="left", padx=(5, 0))
+        self.queue_entry.insert(0, config.QUEUE_FILE)
+
+        browser_frame = tk.LabelFrame(
+            main_frame, text="Tarayıcı Seçenekleri", padx=10, pady=5
+        )
+        browser_frame.pack(fill="x", pady=(0, 10))
+
+        engine_frame = tk.Frame(browser_frame)
+        engine_frame.pack(fill="x", pady=2)
+        tk.Label(engine_frame, text="İşlem motoru:").pack(side="left")
+        self.engine_var = tk.StringVar(value=config.ENGINE)
+        tk.Radiobutton(
+            engine_frame, text="Chrome", variable=self.engine_var, value="selenium"
+        ).pack(side="left", padx=(5, 0))
+        tk.Radiobutton(
+            engine_frame,
+            text="Tarayıcısız (HTTP)",
+            variable=self.engine_var,
+            value="http",
+        ).pack(side="left", padx=(5, 0))
+
+        self.headless_enabled = tk.BooleanVar(value=config.HEADLESS)
+        tk.Checkbutton(
+            browser_frame,
+            text="Arka planda çalıştır (görünmez tarayıcı, resim/font yüklenmez)",
+            variable=self.headless_enabled,
+        ).pack(anchor="w", pady=2)
+
+        resume_frame = tk.LabelFrame(
+            main_frame, text="Devam Seçenekleri", padx=10, pady=5
+        )
+        resume_frame.pack(fill="x", pady=(0, 10))
+
+        self.resume_enabled = tk.BooleanVar(value=config.RESUME_FROM_JOURNAL)
+        tk.Checkbutton(
+            resume_frame,
+            text="Daha önce tamamlananları atla (kaldığı yerden devam et)",
+            variable=self.resume_enabled,
+        ).pack(anchor="w", pady=2)
+
+        self.retry_failures_enabled = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            resume_frame,
+            text="Sadece önceki çalışmalarda başarısız olanları yeniden dene",
+            variable=self.retry_failures_enabled,
+        ).pack(anchor="w", pady=2)
+
         button_frame = tk.Frame(main_frame)
         button_frame.pack(fill="x", pady=(0, 10))
 
@@ -472,6 +259,7 @@ class App(tk.Tk):
 
         self.on_date_toggle()
         self.on_status_toggle()
+        self.on_work_order_toggle()
         self.on_product_toggle()
 
     def on_date_toggle(self):
@@ -486,18 +274,45 @@ class App(tk.Tk):
         else:
             self.status_frame.pack_forget()
 
+    def on_work_order_toggle(self):
+        if self.work_order_enabled.get():
+            self.work_order_frame.pack(fill="x", pady=(5, 0))
+        else:
+            self.work_order_frame.pack_forget()
+
     def on_product_toggle(self):
         if self.product_enabled.get():
             self.product_frame.pack(fill="x", pady=(5, 0))
         else:
             self.product_frame.pack_forget()
 
-    def log(self, text: str):
-        self.log_box.configure(state="normal")
-        self.log_box.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {text}\n")
-        self.log_box.see(tk.END)
-        self.log_box.configure(state="disabled")
-        self.update_idletasks()
+    def log(self, text: str, level: int = logging.INFO):
+        self.log_queue.put(LogEvent(time.time(), text, level))
+        self.file_logger.log(level, text.strip())
+
+    def drain_log_queue(self):
+        lines = []
+        while len(lines) < config.LOG_BATCH_SIZE:
+            try:
+                lines.append(self.log_queue.get_nowait().format())
+            except queue.Empty:
+                break
+
+        if lines:
+            self.log_box.configure(state="normal")
+            self.log_box.insert(tk.END, "\n".join(lines) + "\n")
+            line_count = int(self.log_box.index("end-1c").split(".")[0])
+            if line_count > config.LOG_HISTORY_LINES:
+                self.log_box.delete(
+                    "1.0", f"{line_count - config.LOG_HISTORY_LINES + 1}.0"
+                )
+            self.log_box.see(tk.END)
+            self.log_box.configure(state="disabled")
+
+        if not self.is_running and str(self.start_button["state"]) == "disabled":
+            self.start_button.config(state="normal")
+
+        self.after(config.LOG_POLL_MS, self.drain_log_queue)
 
     def select_file(self):
         file_path = filedialog.askopenfilename(
@@ -515,24 +330,10 @@ class App(tk.Tk):
             self.log(f"Seçilen dosya: {file_path}")
 
     def validate_date_inputs(self) -> tuple[bool, str]:
-        start_date_str = self.start_date_entry.get().strip()
-        end_date_str = self.end_date_entry.get().strip()
-
-        start_date, end_date = DateRangeFilter.parse_date_range(
-            start_date_str, end_date_str
+        return DateRangeFilter.validate_range(
+            self.start_date_entry.get(), self.end_date_entry.get()
         )
 
-        if start_date_str and start_date is None:
-            return False, "Başlangıç tarihi geçersiz format (dd.mm.yyyy kullanın)"
-
-        if end_date_str and end_date is None:
-            return False, "Bitiş tarihi geçersiz format (dd.mm.yyyy kullanın)"
-
-        if start_date and end_date and start_date > end_date:
-            return False, "Başlangıç tarihi bitiş tarihinden sonra olamaz"
-
-        return True, ""
-
     def start_processing(self):
         if self.is_running:
             return
@@ -549,51 +350,102 @@ class App(tk.Tk):
                 messagebox.showerror("Hata", "Durum filtresi için değer giriniz!")
                 return
 
+        if self.work_order_enabled.get():
+            pattern = self.work_order_entries["pattern"].get().strip()
+            is_valid, error_msg = RowCriteria.validate_pattern(pattern)
+            if not is_valid:
+                messagebox.showerror("Hata", error_msg)
+                return
+
+        worker_count = 1
+        use_queue = self.product_enabled.get() and self.queue_enabled.get()
+        if use_queue and not self.queue_entry.get().strip():
+            messagebox.showerror("Hata", "Paylaşımlı kuyruk dosyasını giriniz!")
+            return
+
         if self.product_enabled.get():
-            if not self.selected_file:
+            if (
+                not self.selected_file
+                and not self.retry_failures_enabled.get()
+                and not use_queue
+            ):
                 messagebox.showerror("Hata", "Ürün kodu dosyası seçiniz!")
                 return
 
-        self.date_range = None
+            try:
+                worker_count = int(self.worker_spinbox.get())
+            except ValueError:
+                worker_count = 0
+            if not 1 <= worker_count <= config.MAX_WORKER_COUNT:
+                messagebox.showerror(
+                    "Hata",
+                    f"Paralel tarayıcı sayısı 1 ile {config.MAX_WORKER_COUNT} arasında olmalı!",
+                )
+                return
+
+        options = RunOptions(
+            worker_count=worker_count,
+            resume=self.resume_enabled.get(),
+            retry_failures=self.retry_failures_enabled.get(),
+            use_index=self.index_enabled.get(),
+        )
         if self.date_enabled.get():
-            start_date_str = self.start_date_entry.get().strip()
-            end_date_str = self.end_date_entry.get().strip()
-            self.date_range = DateRangeFilter.parse_date_range(
-                start_date_str, end_date_str
+            options.date_range = DateRangeFilter.parse_date_range(
+                self.start_date_entry.get().strip(), self.end_date_entry.get().strip()
             )
 
-        self.status_filter = None
         if self.status_enabled.get():
-            self.status_filter = self.status_entry.get().strip()
-
-        try:
-            if self.product_enabled.get():
-                self.product_codes = FileProcessor.read_file(self.selected_file)
-                if not self.product_codes:
-                    messagebox.showerror(
-                        "Hata", "Dosyada geçerli ürün kodu bulunamadı!"
-                    )
-                    return
-                self.log(f"Toplam {len(self.product_codes)} ürün kodu yüklendi.")
-
-            filters = []
-            if self.date_enabled.get():
-                start_date_str = self.start_date_entry.get().strip()
-                end_date_str = self.end_date_entry.get().strip()
-                filters.append(f"Tarih: {start_date_str} - {end_date_str}")
+            options.status_filter = self.status_entry.get().strip()
+            options.exclude_statuses = self.exclude_status_entry.get().strip()
 
-            if self.status_enabled.get():
-                filters.append(f"Durum: {self.status_filter}")
-
-            if self.product_enabled.get():
-                filters.append(f"Ürün Kodu: {len(self.product_codes)} kod")
-
-            if not filters:
-                filters.append("Tüm iş emirleri")
+        if self.work_order_enabled.get():
+            options.work_order_prefix = self.work_order_entries["prefix"].get().strip()
+            options.work_order_pattern = (
+                self.work_order_entries["pattern"].get().strip()
+            )
+            options.exclude_work_orders = list(
+                RowCriteria.split(self.work_order_entries["exclude"].get())
+            )
 
-            mode_text = " | ".join(filters)
-            self.log(f"İşlem modu: {mode_text}")
+        if (
+            config.ENGINE != self.engine_var.get()
+            or config.HEADLESS != self.headless_enabled.get()
+        ):
+            close_sessions(self.sessions)
+        config.ENGINE = self.engine_var.get()
+        config.HEADLESS = self.headless_enabled.get()
 
+        try:
+            if use_queue:
+                options.queue_file = self.queue_entry.get().strip()
+                if self.selected_file and not options.retry_failures:
+                    FileProcessor.get_reader(self.selected_file)
+                    options.product_file = self.selected_file
+            elif self.product_enabled.get():
+                if options.retry_failures:
+                    options.product_codes = self.journal.failed_items("code")
+                    if not options.product_codes:
+                        messagebox.showinfo(
+                            "Bilgi", "Yeniden denenecek başarısız ürün kodu yok."
+                        )
+                        return
+                    self.log(
+                        f"Kayıt defterinden {len(options.product_codes)} başarısız kod yüklendi."
+                    )
+                else:
+                    FileProcessor.get_reader(self.selected_file)
+                    options.product_file = self.selected_file
+
+            self.log(f"İşlem modu: {options.describe()}")
+
+            self.runner = BatchRunner(
+                config,
+                options,
+                self.log,
+                self.error_logger,
+                self.journal,
+                self.sessions,
+            )
             self.start_button.config(state="disabled")
             self.is_running = True
 
@@ -602,96 +454,17 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Hata", f"Dosya okunurken hata oluştu:\n{e}")
 
+    def on_close(self):
+        if self.runner:
+            self.runner.stop()
+        close_sessions(self.sessions)
+        self.destroy()
+
     def run_processing(self):
         try:
-            with self.driver_manager.create_driver() as driver:
-                self.driver_manager.navigate_to_start_page()
-                self.log("Site yüklendi, işlem başlatılıyor...")
-
-                if self.product_enabled.get():
-                    for index, product_code in enumerate(self.product_codes, start=1):
-                        if not self.is_running:
-                            break
-
-                        self.log(
-                            f"\n[{index}/{len(self.product_codes)}] İş emri aratılıyor: {product_code}"
-                        )
-
-                        success = False
-                        for attempt in range(config.MAX_RETRIES):
-                            if attempt > 0:
-                                self.log(f"  Yeniden deneme #{attempt + 1}")
-
-                            if self.driver_manager.search_product(product_code):
-                                rows = driver.find_elements(
-                                    By.CSS_SELECTOR,
-                                    'tr[id^="gridViewurnerede_DXDataRow"]',
-                                )
-
-                                if not rows:
-                                    self.log(f"  {product_code} için sonuç bulunamadı")
-                                    self.error_logger.log_error(product_code)
-                                    break
-
-                                self.log(f"  {len(rows)} satır bulundu, işleniyor...")
-
-                                for row_index, row in enumerate(rows):
-                                    if self.driver_manager.process_product_row(
-                                        row,
-                                        row_index,
-                                        self.date_range,
-                                        self.status_filter,
-                                    ):
-                                        success = True
-                                        break
-
-                            if success:
-                                break
-
-                            time.sleep(config.SEARCH_DELAY)
-
-                        if not success:
-                            self.log(f"  {product_code} için işlem başarısız")
-
-                        self.log("  Yeni ürüne geçiliyor.\n")
-                        time.sleep(config.SEARCH_DELAY)
-
-                else:
-                    self.log("Tüm iş emirleri taranıyor...")
-
-                    rows = driver.find_elements(
-                        By.CSS_SELECTOR, 'tr[id^="gridViewurnerede_DXDataRow"]'
-                    )
-
-                    if not rows:
-                        self.log("Hiç satır bulunamadı!")
-                        return
-
-                    self.log(f"{len(rows)} satır bulundu, filtreleniyor...")
-
-                    processed_count = 0
-                    for row_index, row in enumerate(rows):
-                        if not self.is_running:
-                            break
-
-                        if self.driver_manager.process_product_row(
-                            row,
-                            row_index,
-                            self.date_range,
-                            self.status_filter,
-                        ):
-                            processed_count += 1
-
-                    self.log(f"Toplam {processed_count} satır işlendi.")
-
-                self.log("\nTüm işlemler tamamlandı.")
-
-        except Exception as e:
-            self.log(f"Genel hata: {e}")
-
+            self.runner.run()
         finally:
             self.is_running = False
-            self.start_button.config(state="normal")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from dataclasses import replace
+from typing import List
+
+from mock_portal import GRID_PATH, create_server
+from portal_core import PORTAL_ENGINES, BatchRunner, Config, RunOptions, config
+
+MODES = ["product_codes", "all_orders"]
+
+
+def run_case(args: argparse.Namespace, mode: str, size: int, workdir: str) -> dict:
+    server = create_server(
+        order_count=size,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    case_dir = os.path.join(workdir, f"{mode}-{size}")
+    os.makedirs(case_dir)
+    case_config: Config = replace(
+        config,
+        ENGINE=args.engine,
+        HEADLESS=True,
+        WORKER_COUNT=args.workers,
+        MAX_RETRIES=1,
+        SEARCH_DELAY=0,
+        ERROR_FILE=os.path.join(case_dir, "errors.txt"),
+        JOURNAL_FILE=os.path.join(case_dir, "journal.db"),
+        METRICS_FILE=os.path.join(case_dir, "metrics.json"),
+        LATENCY_FILE=os.path.join(case_dir, "latency.json"),
+        DIAGNOSTICS_DIR=os.path.join(case_dir, "diagnostics"),
+        METRICS_PROMETHEUS_FILE="",
+    )
+    case_config.START_URL = f"http://127.0.0.1:{server.server_port}{GRID_PATH}"
+
+    options = RunOptions(worker_count=args.workers, resume=False)
+    if mode == "product_codes":
+        options.product_codes = list(server.state.orders)[: args.codes or size]
+
+    def log(text: str):
+        if args.verbose:
+            print(text.strip(), file=sys.stderr)
+
+    try:
+        summary = BatchRunner(case_config, options, log).run()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    duration = summary.duration_seconds
+    return {
+        "mode": mode,
+        "grid_size": size,
+        "items": summary.total,
+        "succeeded": summary.succeeded,
+        "failed": summary.failed + summary.not_found,
+        "duration_seconds": duration,
+        "work_orders_per_minute": (
+            round(summary.succeeded * 60 / duration, 1) if duration else 0.0
+        ),
+        "requests": server.state.requests,
+        "injected_failures": server.state.failures,
+        "error": summary.error,
+    }
+
+
+def print_table(results: List[dict]):
+    header = f"{'mode':<14}{'grid':>7}{'items':>7}{'ok':>7}{'fail':>6}{'sec':>9}{'wo/min':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['mode']:<14}{result['grid_size']:>7}{result['items']:>7}"
+            f"{result['succeeded']:>7}{result['failed']:>6}"
+            f"{result['duration_seconds']:>9.2f}{result['work_orders_per_minute']:>10.1f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Work-order throughput against the bundled mock portal"
+    )
+    parser.add_argument("--engine", choices=sorted(PORTAL_ENGINES), default="http")
+    parser.add_argument(
+        "--sizes", default="50,200,1000", help="Comma-separated grid sizes"
+    )
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--codes",
+        type=int,
+        default=0,
+        help="Product codes per run (default: grid size)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unsupported mode: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="portal-bench-") as workdir:
+        for size in sizes:
+            for mode in modes:
+                results.append(run_case(args, mode, size, workdir))
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if any(result["error"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from portal_core import (
+    PORTAL_ENGINES,
+    BatchRunner,
+    CheckpointJournal,
+    Config,
+    DateRangeFilter,
+    DiagnosticsSink,
+    ErrorLogger,
+    FileProcessor,
+    LogEvent,
+    RowCriteria,
+    RunOptions,
+    RunSummary,
+    SharedWorkQueue,
+    config,
+    create_file_logger,
+)
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_FATAL = 3
+EXIT_INTERRUPTED = 130
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Portal Cleaner Ultimate - headless batch runner"
+    )
+    parser.add_argument("--config", help="JSON file with Config overrides")
+    parser.add_argument("--codes", help="Product code file (.txt, .xlsx, .xls, .xml)")
+    parser.add_argument(
+        "--retry-failures",
+        nargs="?",
+        const="codes",
+        choices=["codes", "orders"],
+        help="Only retry product codes (default) or work orders recorded as failed",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Read the whole grid once and resolve product codes in memory",
+    )
+    parser.add_argument(
+        "--queue",
+        nargs="?",
+        const="",
+        help="Share product codes with other machines through this SQLite file "
+        "(default: Config.QUEUE_FILE); --codes adds codes to it",
+    )
+    parser.add_argument(
+        "--queue-report",
+        action="store_true",
+        help="Print the merged result of the shared queue and exit",
+    )
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip items already completed in the journal",
+    )
+    resume.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Do not skip items already completed in the journal",
+    )
+    parser.add_argument("--start-date", default="", help="dd.mm.yyyy")
+    parser.add_argument("--end-date", default="", help="dd.mm.yyyy")
+    parser.add_argument(
+        "--status", help="Only process rows with these statuses (comma-separated)"
+    )
+    parser.add_argument(
+        "--exclude-status", help="Skip rows with these statuses (comma-separated)"
+    )
+    parser.add_argument(
+        "--work-order-prefix",
+        help="Only process work orders starting with these prefixes (comma-separated)",
+    )
+    parser.add_argument(
+        "--work-order-pattern", help="Only process work orders matching this regex"
+    )
+    parser.add_argument(
+        "--exclude", help="File with work orders to skip (.txt, .xlsx, .xls, .xml)"
+    )
+    parser.add_argument("--workers", type=int, help="Parallel sessions")
+    parser.add_argument("--engine", choices=sorted(PORTAL_ENGINES))
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--start-url", help="Override Config.START_URL")
+    parser.add_argument("--summary-file", help="Also write the JSON summary here")
+    parser.add_argument(
+        "--quiet", action="store_true", help="Only print the JSON summary"
+    )
+    return parser
+
+
+def load_config_file(target: Config, path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"Config file must contain a JSON object: {path}")
+
+    for key, value in overrides.items():
+        if not hasattr(target, key):
+            raise ValueError(f"Unknown config key: {key}")
+        setattr(target, key, value)
+
+
+def apply_arguments(target: Config, args: argparse.Namespace):
+    if args.config:
+        load_config_file(target, args.config)
+    if args.engine:
+        target.ENGINE = args.engine
+    if args.headless:
+        target.HEADLESS = True
+    if args.start_url:
+        target.START_URL = args.start_url
+    if args.workers is not None:
+        target.WORKER_COUNT = args.workers
+    if not 1 <= target.WORKER_COUNT <= target.MAX_WORKER_COUNT:
+        raise ValueError(f"--workers must be between 1 and {target.MAX_WORKER_COUNT}")
+
+
+def build_options(
+    target: Config, args: argparse.Namespace, journal: CheckpointJournal
+) -> RunOptions:
+    options = RunOptions(
+        worker_count=target.WORKER_COUNT,
+        resume=(target.RESUME_FROM_JOURNAL or args.resume) and not args.no_resume,
+        retry_failures=args.retry_failures is not None,
+        use_index=target.PRODUCT_CODE_INDEX or args.index,
+    )
+
+    if args.start_date or args.end_date:
+        is_valid, error_msg = DateRangeFilter.validate_range(
+            args.start_date, args.end_date
+        )
+        if not is_valid:
+            raise ValueError(error_msg)
+        options.date_range = DateRangeFilter.parse_date_range(
+            args.start_date, args.end_date
+        )
+
+    if args.status is not None:
+        if not args.status.strip():
+            raise ValueError("--status must not be empty")
+        options.status_filter = args.status.strip()
+    if args.exclude_status:
+        options.exclude_statuses = args.exclude_status.strip()
+    if args.work_order_prefix:
+        options.work_order_prefix = args.work_order_prefix.strip()
+    if args.work_order_pattern:
+        is_valid, error_msg = RowCriteria.validate_pattern(args.work_order_pattern)
+        if not is_valid:
+            raise ValueError(error_msg)
+        options.work_order_pattern = args.work_order_pattern
+    if args.exclude:
+        options.exclude_work_orders = FileProcessor.read_file(args.exclude)
+
+    if args.queue is not None:
+        options.queue_file = queue_file(target, args)
+    if args.codes and args.retry_failures:
+        raise ValueError("--codes and --retry-failures cannot be combined")
+    if args.codes:
+        FileProcessor.get_reader(args.codes)
+        options.product_file = args.codes
+    elif args.retry_failures == "codes" and options.queue_file is None:
+        options.product_codes = journal.failed_items("code")
+
+    return options
+
+
+def queue_file(target: Config, args: argparse.Namespace) -> str:
+    path = args.queue or target.QUEUE_FILE
+    if not path:
+        raise ValueError("--queue needs a path or Config.QUEUE_FILE")
+    return path
+
+
+def emit_summary(summary: dict, summary_file: Optional[str] = None):
+    text = json.dumps(summary, ensure_ascii=False)
+    print(text, flush=True)
+    if summary_file:
+        with open(summary_file, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def summary_exit_code(summary: RunSummary) -> int:
+    if summary.error:
+        return EXIT_FATAL
+    if summary.failed or summary.not_found:
+        return EXIT_FAILURES
+    return EXIT_OK
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        apply_arguments(config, args)
+        if args.queue_report:
+            work_queue = SharedWorkQueue(queue_file(config, args))
+            emit_summary(work_queue.report(), args.summary_file)
+            work_queue.close()
+            return EXIT_OK
+        journal = CheckpointJournal(config.JOURNAL_FILE)
+        options = build_options(config, args, journal)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    file_logger = create_file_logger(config.LOG_FILE)
+
+    output_lock = threading.Lock()
+
+    def log(text: str):
+        if not args.quiet:
+            with output_lock:
+                sys.stdout.write(LogEvent(time.time(), text).format() + "\n")
+                sys.stdout.flush()
+        file_logger.info(text.strip())
+
+    runner = BatchRunner(
+        config,
+        options,
+        log,
+        ErrorLogger(config.ERROR_FILE, DiagnosticsSink.from_config(config)),
+        journal,
+    )
+    if options.product_codes == []:
+        log("Yeniden denenecek başarısız ürün kodu yok.")
+        journal.close()
+        emit_summary(runner.summary.to_dict(), args.summary_file)
+        return EXIT_OK
+
+    log(f"İşlem modu: {options.describe()}")
+    try:
+        summary = runner.run()
+        exit_code = summary_exit_code(summary)
+    except KeyboardInterrupt:
+        runner.stop()
+        summary = runner.summary
+        summary.stopped = True
+        exit_code = EXIT_INTERRUPTED
+    finally:
+        journal.close()
+
+    emit_summary(summary.to_dict(), args.summary_file)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+import argparse
+import base64
+import html
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+GRID_PATH = "/Uretim/UrunNerede"
+PRODUCT_PATH = "/Uretim/UrunDetay"
+STATUSES = ["HAZIRLIK", "ÜRETİM", "KONTROL"]
+GRID_COLUMNS = 15
+GRID_FIELDS = {2: "IsEmriNo", 3: "Urun", 6: "Durum", 14: "Tarih"}
+GRID_CAPTIONS = {2: "İş Emri No", 3: "Ürün", 6: "Durum", 14: "Tarih"}
+FILTER_PREFIX = "APPLYFILTER|"
+NEXT_PAGE_ARGUMENT = "PBN"
+PREVIOUS_PAGE_ARGUMENT = "PBP"
+REFRESH_ARGUMENT = "REFRESH"
+FILTER_PATTERN = re.compile(r"\[(\w+)\] (=|>=|<) (?:'((?:[^']|'')*)'|#([\d-]+)#)")
+
+POSTBACK_SCRIPT = """
+<script>
+function __doPostBack(target, argument) {
+    var form = document.forms[0];
+    form.__EVENTTARGET.value = target;
+    form.__EVENTARGUMENT.value = argument;
+    form.submit();
+}
+</script>
+"""
+
+GRID_CLIENT_SCRIPT = """
+<script>
+var gridViewurnerede = {
+    fields: %s,
+    pageIndex: __PAGE_INDEX__,
+    pageCount: __PAGE_COUNT__,
+    InCallback: function () { return false; },
+    GetPageIndex: function () { return this.pageIndex; },
+    GetPageCount: function () { return this.pageCount; },
+    NextPage: function () { __doPostBack("gridViewurnerede", "%s"); },
+    PrevPage: function () { __doPostBack("gridViewurnerede", "%s"); },
+    Refresh: function () { __doPostBack("gridViewurnerede", "%s"); },
+    GetColumn: function (index) {
+        var name = this.fields[index];
+        return name ? {index: index, fieldName: name} : null;
+    },
+    ApplyFilter: function (expression) {
+        __doPostBack("gridViewurnerede", "%s" + expression);
+    }
+};
+document.addEventListener("keydown", function (event) {
+    var target = event.target;
+    if (event.key === "Enter" && target.id && target.id.indexOf("gridViewurnerede_DXFREditor") === 0) {
+        event.preventDefault();
+        __doPostBack("gridViewurnerede", "");
+    }
+});
+</script>
+""" % (
+    json.dumps({str(k): v for k, v in GRID_FIELDS.items()}),
+    NEXT_PAGE_ARGUMENT,
+    PREVIOUS_PAGE_ARGUMENT,
+    REFRESH_ARGUMENT,
+    FILTER_PREFIX,
+)
+
+ERROR_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Sunucu Hatası</title></head>
+<body>
+<h1>Server Error in '/' Application.</h1>
+<h2><i>Subquery returned more than 1 value. This is not permitted when the subquery follows =, !=, &lt;, &lt;= , &gt;, &gt;= or when the subquery is used as an expression.</i></h2>
+</body>
+</html>"""
+
+
+class MockPortalState:
+
+    def __init__(
+        self,
+        order_count: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        page_size: int = 20,
+        shuffle_columns: bool = False,
+    ):
+        self.lock = threading.Lock()
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.column_order = list(range(GRID_COLUMNS))
+        if shuffle_columns:
+            self.random.shuffle(self.column_order)
+        self.requests = 0
+        self.failures = 0
+        self.orders: Dict[str, dict] = {}
+        start = date(2025, 7, 1)
+        for index in range(order_count):
+            work_order = f"WO{index + 1:05d}"
+            self.orders[work_order] = {
+                "work_order": work_order,
+                "status": STATUSES[index % len(STATUSES)],
+                "date": (start + timedelta(days=index % 30)).strftime("%d.%m.%Y"),
+                "quantity": str(10 + index % 90),
+                "stage": "new",
+            }
+
+    def find_orders(
+        self, code: str = "", status: str = "", filter_expression: str = ""
+    ) -> List[dict]:
+        groups = [
+            FILTER_PATTERN.findall(part) for part in filter_expression.split(" And ")
+        ]
+        with self.lock:
+            return [
+                dict(order)
+                for order in self.orders.values()
+                if code.upper() in order["work_order"].upper()
+                and (not status or order["status"].upper() == status.upper())
+                and all(
+                    any(self.matches(order, *condition) for condition in group)
+                    for group in groups
+                    if group
+                )
+            ]
+
+    @staticmethod
+    def matches(order: dict, field: str, operator: str, text: str, day: str) -> bool:
+        if field == GRID_FIELDS[6]:
+            return order["status"].upper() == text.replace("''", "'").upper()
+        if field == GRID_FIELDS[14]:
+            order_day = datetime.strptime(order["date"], "%d.%m.%Y").date().isoformat()
+            return order_day >= day if operator == ">=" else order_day < day
+        return False
+
+    def simulate_network(self, can_fail: bool = True) -> bool:
+        with self.lock:
+            self.requests += 1
+            delay = max(
+                0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)
+            )
+            failed = can_fail and self.random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        return failed
+
+
+class MockPortalHandler(BaseHTTPRequestHandler):
+
+    server_version = "MockPortal/1.0"
+
+    @property
+    def state(self) -> MockPortalState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if self.state.simulate_network(url.path == PRODUCT_PATH):
+            self.send_page(ERROR_PAGE, 500)
+            return
+        if url.path == GRID_PATH:
+            self.send_page(self.render_grid({}))
+        elif url.path == PRODUCT_PATH:
+            order = self.lookup_order(url.query)
+            if order is None:
+                self.send_error(404)
+                return
+            self.send_page(self.render_product(order))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = {
+            key: values[0]
+            for key, values in parse_qs(
+                self.rfile.read(length).decode("utf-8"), keep_blank_values=True
+            ).items()
+        }
+
+        if "ASP.NET_SessionId" not in (self.headers.get("Cookie") or ""):
+            self.send_error(400, "Missing session cookie")
+            return
+        view_state = self.decode_view_state(fields.get("__VIEWSTATE", ""))
+        if view_state is None or view_state.get("path") != url.path:
+            self.send_error(400, "Invalid view state")
+            return
+        if self.state.simulate_network(url.path == PRODUCT_PATH):
+            self.send_page(ERROR_PAGE, 500)
+            return
+
+        if url.path == GRID_PATH:
+            self.send_page(self.render_grid(fields))
+        elif url.path == PRODUCT_PATH:
+            order = self.lookup_order(url.query)
+            if order is None:
+                self.send_error(404)
+                return
+            self.handle_product_postback(order, fields)
+            self.send_page(self.render_product(order))
+        else:
+            self.send_error(404)
+
+    def lookup_order(self, query: str) -> Optional[dict]:
+        work_order = parse_qs(query).get("id", [""])[0]
+        return self.state.orders.get(work_order)
+
+    def handle_product_postback(self, order: dict, fields: dict):
+        target = fields.get("__EVENTTARGET", "")
+        transitions = {
+            ("new", "Baslat"): "starting",
+            ("starting", "btnUpdatebaslat"): "started",
+            ("started", "Bitir"): "finishing",
+        }
+        with self.state.lock:
+            next_stage = transitions.get((order["stage"], target))
+            if next_stage:
+                order["stage"] = next_stage
+            elif order["stage"] == "finishing" and target == "btnUpdate":
+                if fields.get("Brut") == order["quantity"]:
+                    order["stage"] = "closed"
+                    order["status"] = "TAMAMLANDI"
+
+    @staticmethod
+    def encode_view_state(path: str) -> str:
+        payload = json.dumps({"path": path, "nonce": uuid.uuid4().hex})
+        return base64.b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_view_state(value: str) -> Optional[dict]:
+        try:
+            return json.loads(base64.b64decode(value.encode("ascii")))
+        except ValueError:
+            return None
+
+    def send_page(self, body: str, status: int = 200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if "ASP.NET_SessionId" not in (self.headers.get("Cookie") or ""):
+            self.send_header(
+                "Set-Cookie", f"ASP.NET_SessionId={uuid.uuid4().hex}; path=/; HttpOnly"
+            )
+        self.end_headers()
+        self.wfile.write(data)
+
+    def render_form(self, path: str, title: str, content: str) -> str:
+        return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>
+<body>
+<form method="post" action="{html.escape(self.path)}">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="">
+<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{self.encode_view_state(path)}">
+{content}
+</form>
+{POSTBACK_SCRIPT}
+</body>
+</html>"""
+
+    def render_grid(self, fields: dict) -> str:
+        code = fields.get("gridViewurnerede$DXFREditorcol4", "")
+        status = fields.get("gridViewurnerede$DXFREditorcol6", "")
+        argument = fields.get("__EVENTARGUMENT", "")
+        filter_expression = fields.get("gridViewurnerede$FilterExpression", "")
+        if argument.startswith(FILTER_PREFIX):
+            filter_expression = argument[len(FILTER_PREFIX) :]
+        orders = self.state.find_orders(code, status, filter_expression)
+
+        page_size = self.state.page_size or len(orders) or 1
+        page_count = max(1, (len(orders) + page_size - 1) // page_size)
+        try:
+            page_index = int(fields.get("gridViewurnerede$PageIndex", "0"))
+        except ValueError:
+            page_index = 0
+        if argument == NEXT_PAGE_ARGUMENT:
+            page_index += 1
+        elif argument == PREVIOUS_PAGE_ARGUMENT:
+            page_index -= 1
+        elif argument != REFRESH_ARGUMENT:
+            page_index = 0
+        page_index = min(max(page_index, 0), page_count - 1)
+        first = page_index * page_size
+
+        column_order = self.state.column_order
+        rows = []
+        for index, order in enumerate(orders[first : first + page_size], start=first):
+            cells = [""] * GRID_COLUMNS
+            cells[2] = html.escape(order["work_order"])
+            cells[3] = (
+                f'<a href="{PRODUCT_PATH}?id={order["work_order"]}" target="_blank">'
+                f'{html.escape(order["work_order"])}</a>'
+            )
+            cells[6] = html.escape(order["status"])
+            cells[14] = order["date"]
+            rows.append(
+                f'<tr id="gridViewurnerede_DXDataRow{index}">'
+                + "".join(f"<td>{cells[column]}</td>" for column in column_order)
+                + "</tr>"
+            )
+        headers = "".join(
+            f"<td>{html.escape(GRID_CAPTIONS.get(column, f'Kolon {column}'))}</td>"
+            for column in column_order
+        )
+
+        content = f"""
+<input type="text" id="gridViewurnerede_DXFREditorcol4_I" name="gridViewurnerede$DXFREditorcol4" value="{html.escape(code)}">
+<input type="text" id="gridViewurnerede_DXFREditorcol6_I" name="gridViewurnerede$DXFREditorcol6" value="{html.escape(status)}">
+<input type="hidden" name="gridViewurnerede$FilterExpression" value="{html.escape(filter_expression)}">
+<input type="hidden" name="gridViewurnerede$PageIndex" value="{page_index}">
+<table id="gridViewurnerede_DXMainTable">
+<tr id="gridViewurnerede_DXHeadersRow0">{headers}</tr>
+{''.join(rows)}
+</table>
+<div id="gridViewurnerede_DXPagerBottom">Sayfa {page_index + 1} / {page_count} ({len(orders)} kayıt)</div>
+{GRID_CLIENT_SCRIPT.replace("__PAGE_INDEX__", str(page_index)).replace("__PAGE_COUNT__", str(page_count))}"""
+        return self.render_form(GRID_PATH, "Ürün Nerede", content)
+
+    def render_product(self, order: dict) -> str:
+        stage = order["stage"]
+        parts = [
+            f'<input type="text" id="Miktar_I" name="Miktar" value="{order["quantity"]}" readonly>'
+        ]
+        button = '<input type="button" id="{0}" value="{0}" onclick="__doPostBack(\'{0}\', \'\')">'
+        if stage == "new":
+            parts.append(button.format("Baslat"))
+        elif stage == "starting":
+            parts.append(button.format("btnUpdatebaslat"))
+        elif stage == "started":
+            parts.append(button.format("Bitir"))
+        elif stage == "finishing":
+            parts.append('<input type="text" id="Brut_I" name="Brut" value="">')
+            parts.append(
+                "<div id=\"btnUpdate_CD\" onclick=\"__doPostBack('btnUpdate', '')\">Kaydet</div>"
+            )
+        else:
+            parts.append("<p>Kaydedildi</p>")
+        return self.render_form(PRODUCT_PATH, order["work_order"], "\n".join(parts))
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    order_count: int = 50,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    failure_rate: float = 0.0,
+    seed: Optional[int] = None,
+    page_size: int = 20,
+    shuffle_columns: bool = False,
+) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MockPortalHandler)
+    server.daemon_threads = True
+    server.state = MockPortalState(
+        order_count, latency, jitter, failure_rate, seed, page_size, shuffle_columns
+    )
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the ERP portal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random +/- seconds around --latency"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of product page requests answered with an ASP.NET error page (0-1)",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for jitter and failures")
+    parser.add_argument(
+        "--page-size", type=int, default=20, help="Grid rows per page (0 = no paging)"
+    )
+    parser.add_argument(
+        "--shuffle-columns",
+        action="store_true",
+        help="Render the grid columns in a random order (seeded by --seed)",
+    )
+    args = parser.parse_args()
+
+    server = create_server(
+        args.host,
+        args.port,
+        args.orders,
+        args.latency,
+        args.jitter,
+        args.failure_rate,
+        args.seed,
+        args.page_size,
+        args.shuffle_columns,
+    )
+    print(f"Mock portal: http://{args.host}:{server.server_port}{GRID_PATH}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
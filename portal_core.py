@@ -0,0 +1,2898 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import re
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from functools import cached_property, lru_cache
+from html.parser import HTMLParser
+from http.cookies import SimpleCookie
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlencode, urljoin
+
+
+@dataclass
+class Config:
+    BASE_URL = "http://192.168.1.248/"
+    START_URL = BASE_URL + "Uretim/UrunNerede"
+    WAIT_TIMEOUT: int = 10
+    POLL_INTERVAL: float = 0.1
+    SETTLE_QUIET_PERIOD: float = 0.5
+    USE_FIXED_DELAYS: bool = False
+    PAGE_LOAD_DELAY: int = 15
+    SEARCH_DELAY: int = 2
+    CLICK_DELAY: int = 1
+    UPDATE_DELAY: int = 2
+    MAX_RETRIES: int = 3
+    RETRY_BACKOFF_BASE: float = 1.0
+    RETRY_BACKOFF_MAX: float = 30.0
+    WORKER_COUNT: int = 1
+    MAX_WORKER_COUNT: int = 8
+    ERROR_FILE: str = "error_urunler.txt"
+    JOURNAL_FILE: str = "portal_journal.db"
+    LOG_FILE: str = "portal_cleaner.log"
+    LOG_FILE_MAX_BYTES: int = 5 * 1024 * 1024
+    LOG_FILE_BACKUPS: int = 5
+    LOG_POLL_MS: int = 100
+    LOG_BATCH_SIZE: int = 500
+    LOG_HISTORY_LINES: int = 5000
+    METRICS_FILE: str = "portal_metrics.json"
+    METRICS_PROMETHEUS_FILE: str = "portal_metrics.prom"
+    LATENCY_TUNING: bool = True
+    LATENCY_FILE: str = "portal_latency.json"
+    LATENCY_WINDOW: int = 200
+    LATENCY_MIN_SAMPLES: int = 20
+    LATENCY_QUANTILE: float = 0.99
+    LATENCY_TIMEOUT_FACTOR: float = 2.0
+    LATENCY_MIN_TIMEOUT: float = 2.0
+    LATENCY_MAX_TIMEOUT: float = 60.0
+    LATENCY_MAX_STRETCH: float = 3.0
+    RESUME_FROM_JOURNAL: bool = False
+    PRODUCT_CODE_INDEX: bool = False
+    PRODUCT_INDEX_CONTAINS: bool = True
+    QUEUE_FILE: str = ""
+    QUEUE_OWNER: str = ""
+    QUEUE_LEASE_SECONDS: float = 600.0
+    QUEUE_POLL_INTERVAL: float = 5.0
+    QUEUE_LOCK_TIMEOUT: float = 60.0
+
+    WORK_ORDER_COLUMN: int = 2
+    LINK_COLUMN: int = 3
+    STATUS_COLUMN: int = 6
+    DATE_COLUMN: int = 14
+    MIN_GRID_COLUMNS: int = 15
+
+    SEARCH_EDITOR_ID: str = "gridViewurnerede_DXFREditorcol4_I"
+    PUSH_DOWN_FILTERS: bool = True
+    STATUS_FILTER_EDITOR_ID: str = "gridViewurnerede_DXFREditorcol6_I"
+    DATE_FILTER_EDITOR_ID: str = "gridViewurnerede_DXFREditorcol14_I"
+
+    ENGINE: str = "selenium"
+    HTTP_POOL_SIZE: int = 4
+    HTTP_MAX_REDIRECTS: int = 5
+    HTTP_GRID_EVENT_TARGET: str = "gridViewurnerede"
+    HTTP_GRID_NEXT_PAGE_ARGUMENT: str = "PBN"
+    HTTP_GRID_REFRESH_ARGUMENT: str = "REFRESH"
+
+    HEADLESS: bool = False
+    KEEP_SESSION_WARM: bool = True
+    CHROME_PROFILE_DIR: str = ""
+    CHROME_DISK_CACHE_SIZE: int = 256 * 1024 * 1024
+    REUSE_WORKER_TAB: bool = True
+    PIPELINE_SEARCH: bool = True
+    GRID_CAPTURE: bool = False
+    RECYCLE_AFTER_ITEMS: int = 500
+    RECYCLE_CHECK_INTERVAL: int = 25
+    RECYCLE_RSS_MB: int = 1500
+    RECYCLE_HEAP_MB: int = 512
+    WINDOW_SIZE: str = "1920,1080"
+
+    RATE_CONTROL: bool = True
+    RATE_MIN_INTERVAL: float = 0.0
+    RATE_MAX_INTERVAL: float = 10.0
+    RATE_INTERVAL_STEP: float = 0.1
+    RATE_RECOVERY_FACTOR: float = 0.7
+    RATE_TARGET_LATENCY: float = 15.0
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_MIN_SAMPLES: int = 5
+    CIRCUIT_ERROR_RATIO: float = 0.5
+    CIRCUIT_COOLDOWN: float = 30.0
+    CIRCUIT_MAX_COOLDOWN: float = 300.0
+
+    ERROR_DETECTOR: str = "aspnet"
+    ERROR_EXCERPT_LENGTH: int = 500
+    DIAGNOSTICS_DIR: str = "diagnostics"
+    DIAGNOSTICS_SCREENSHOT: bool = True
+    DIAGNOSTICS_DOM_CHARS: int = 20000
+    DIAGNOSTICS_QUEUE_SIZE: int = 64
+    DIAGNOSTICS_MAX_ARTIFACTS: int = 1000
+
+    ERROR_KEYWORDS: List[str] = None
+    ERROR_CONTAINER_SELECTORS: List[str] = None
+    BLOCKED_URL_PATTERNS: List[str] = None
+    GRID_COLUMN_HEADERS: Dict[str, List[str]] = None
+
+    def __post_init__(self):
+        if self.GRID_COLUMN_HEADERS is None:
+            self.GRID_COLUMN_HEADERS = {
+                "work_order": ["İş Emri No", "İş Emri", "IsEmriNo"],
+                "link": ["Ürün", "Ürün Kodu", "Urun"],
+                "status": ["Durum", "Durumu"],
+                "date": ["Tarih", "Sipariş Tarihi"],
+            }
+        if self.ERROR_CONTAINER_SELECTORS is None:
+            self.ERROR_CONTAINER_SELECTORS = [
+                "h1",
+                "h2",
+                "[class*='ErrorRow']",
+                "[id*='ErrorMessage']",
+                ".validation-summary-errors",
+            ]
+        if self.BLOCKED_URL_PATTERNS is None:
+            self.BLOCKED_URL_PATTERNS = [
+                "*.png",
+                "*.jpg",
+                "*.jpeg",
+                "*.gif",
+                "*.svg",
+                "*.ico",
+                "*.webp",
+                "*.woff",
+                "*.woff2",
+                "*.ttf",
+                "*.eot",
+            ]
+        if self.ERROR_KEYWORDS is None:
+            self.ERROR_KEYWORDS = [
+                "subquery returned more than 1 value",
+                "nesne başvurusu bir nesnenin örneğine ayarlanmadı",
+                "sunucu hatası",
+                "system.nullreferenceexception",
+                "server error",
+                "geçerli web isteği yürütülürken işlenmemiş özel durum",
+            ]
+
+
+config = Config()
+
+
+class DateRangeFilter:
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse_date(date_str: str) -> Optional[date]:
+        try:
+            return datetime.strptime(date_str.strip(), "%d.%m.%Y").date()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_date_range(
+        start_date_str: str, end_date_str: str
+    ) -> tuple[Optional[date], Optional[date]]:
+        start_date = (
+            DateRangeFilter.parse_date(start_date_str)
+            if start_date_str.strip()
+            else None
+        )
+        end_date = (
+            DateRangeFilter.parse_date(end_date_str) if end_date_str.strip() else None
+        )
+        return start_date, end_date
+
+    @staticmethod
+    def validate_range(start_date_str: str, end_date_str: str) -> tuple[bool, str]:
+        start_date, end_date = DateRangeFilter.parse_date_range(
+            start_date_str, end_date_str
+        )
+
+        if start_date_str.strip() and start_date is None:
+            return False, "Başlangıç tarihi geçersiz format (dd.mm.yyyy kullanın)"
+
+        if end_date_str.strip() and end_date is None:
+            return False, "Bitiş tarihi geçersiz format (dd.mm.yyyy kullanın)"
+
+        if start_date and end_date and start_date > end_date:
+            return False, "Başlangıç tarihi bitiş tarihinden sonra olamaz"
+
+        return True, ""
+
+    @staticmethod
+    def is_date_in_range(
+        order_date_str: str, start_date: Optional[date], end_date: Optional[date]
+    ) -> bool:
+        try:
+            order_date = DateRangeFilter.parse_date(order_date_str)
+            if order_date is None:
+                return False
+
+            if start_date and end_date:
+                return start_date <= order_date <= end_date
+            elif start_date:
+                return order_date >= start_date
+            elif end_date:
+                return order_date <= end_date
+            else:
+                return True
+
+        except Exception:
+            return False
+
+
+@dataclass
+class IngestStats:
+    total: int = 0
+    blank: int = 0
+    duplicates: int = 0
+    unique: int = 0
+
+
+class FileProcessor:
+
+    FLOAT_CODE_PATTERN = re.compile(r"(\d+)\.0+")
+
+    @classmethod
+    def normalize_code(cls, value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        text = str(value).strip()
+        match = cls.FLOAT_CODE_PATTERN.fullmatch(text)
+        return match.group(1) if match else text
+
+    @staticmethod
+    def iter_txt_file(file_path: str) -> Iterator[str]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from f
+
+    @staticmethod
+    def iter_xlsx_file(file_path: str) -> Iterator:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for (value,) in wb.active.iter_rows(min_col=1, max_col=1, values_only=True):
+                yield value
+        finally:
+            wb.close()
+
+    @staticmethod
+    def iter_xls_file(file_path: str) -> Iterator:
+        import xlrd
+
+        wb = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            sheet = wb.sheet_by_index(0)
+            for i in range(sheet.nrows):
+                yield sheet.cell_value(i, 0)
+        finally:
+            wb.release_resources()
+
+    @staticmethod
+    def iter_xml_file(file_path: str) -> Iterator[str]:
+        import xml.etree.ElementTree as ET
+
+        context = ET.iterparse(file_path, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event == "end" and elem.tag == "kod":
+                yield elem.text
+                root.clear()
+
+    @classmethod
+    def read_txt_file(cls, file_path: str) -> List[str]:
+        return cls.read_values(cls.iter_txt_file(file_path))
+
+    @classmethod
+    def read_xlsx_file(cls, file_path: str) -> List[str]:
+        return cls.read_values(cls.iter_xlsx_file(file_path))
+
+    @classmethod
+    def read_xls_file(cls, file_path: str) -> List[str]:
+        return cls.read_values(cls.iter_xls_file(file_path))
+
+    @classmethod
+    def read_xml_file(cls, file_path: str) -> List[str]:
+        return cls.read_values(cls.iter_xml_file(file_path))
+
+    @classmethod
+    def read_values(cls, values: Iterable) -> List[str]:
+        return [code for code in map(cls.normalize_code, values) if code]
+
+    @classmethod
+    def get_reader(cls, file_path: str) -> Callable[[str], Iterator]:
+        file_extension = Path(file_path).suffix.lower()
+
+        readers = {
+            ".txt": cls.iter_txt_file,
+            ".xlsx": cls.iter_xlsx_file,
+            ".xls": cls.iter_xls_file,
+            ".xml": cls.iter_xml_file,
+        }
+
+        reader = readers.get(file_extension)
+        if not reader:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+
+        return reader
+
+    @classmethod
+    def iter_codes(
+        cls, file_path: str, stats: Optional[IngestStats] = None
+    ) -> Iterator[str]:
+        reader = cls.get_reader(file_path)
+        stats = stats if stats is not None else IngestStats()
+        seen = set()
+
+        for value in reader(file_path):
+            stats.total += 1
+            code = cls.normalize_code(value)
+            if not code:
+                stats.blank += 1
+            elif code in seen:
+                stats.duplicates += 1
+            else:
+                seen.add(code)
+                stats.unique += 1
+                yield code
+
+    @classmethod
+    def read_file(cls, file_path: str) -> List[str]:
+        return list(cls.iter_codes(file_path))
+
+
+class DiagnosticsSink:
+
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, directory: str, queue_size: int = 64, max_artifacts: int = 1000):
+        self.directory = directory
+        self.max_artifacts = max_artifacts
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.sequence = 0
+        self.artifacts = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional["DiagnosticsSink"]:
+        if not config.DIAGNOSTICS_DIR:
+            return None
+        return cls(
+            config.DIAGNOSTICS_DIR,
+            config.DIAGNOSTICS_QUEUE_SIZE,
+            config.DIAGNOSTICS_MAX_ARTIFACTS,
+        )
+
+    def submit(
+        self, record: dict, artifacts: Optional[Dict[str, bytes]] = None
+    ) -> bool:
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self._writer, name="diagnostics", daemon=True
+                )
+                self.thread.start()
+        record = dict(record, time=datetime.now().isoformat(timespec="milliseconds"))
+        try:
+            self.queue.put_nowait((record, artifacts or {}))
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        if self.thread is None or not self.thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _writer(self):
+        index = None
+        while True:
+            item = self.queue.get()
+            if isinstance(item, threading.Event):
+                if index is not None:
+                    index.close()
+                    index = None
+                item.set()
+                continue
+
+            record, artifacts = item
+            try:
+                if index is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    index = open(
+                        os.path.join(self.directory, self.INDEX_FILE),
+                        "a",
+                        encoding="utf-8",
+                    )
+                record["artifacts"] = self.write_artifacts(record, artifacts)
+                index.write(json.dumps(record, ensure_ascii=False) + "\n")
+                index.flush()
+            except OSError:
+                self.errors += 1
+
+    def write_artifacts(self, record: dict, artifacts: Dict[str, bytes]) -> List[str]:
+        if not artifacts or self.artifacts >= self.max_artifacts:
+            return []
+
+        self.sequence += 1
+        self.artifacts += 1
+        label = record.get("code") or record.get("work_order") or "item"
+        stem = "{}-{:05d}-{}".format(
+            datetime.now().strftime("%Y%m%d-%H%M%S"),
+            self.sequence,
+            re.sub(r"[^\w.-]+", "_", label)[:40],
+        )
+        names = []
+        for name, data in artifacts.items():
+            file_name = f"{stem}-{name}.gz"
+            with gzip.open(os.path.join(self.directory, file_name), "wb") as f:
+                f.write(data)
+            names.append(file_name)
+        return names
+
+
+class ErrorLogger:
+
+    def __init__(
+        self,
+        error_file: str = config.ERROR_FILE,
+        diagnostics: Optional[DiagnosticsSink] = None,
+    ):
+        self.error_file = error_file
+        self.diagnostics = diagnostics
+        self.lock = threading.Lock()
+        self.file = None
+
+    def log_error(self, product_code: str):
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.error_file, "a", encoding="utf-8")
+            self.file.write(f"{product_code}\n")
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        if self.diagnostics:
+            self.diagnostics.flush()
+
+
+class CheckpointJournal:
+
+    DONE = "done"
+    FAILED = "failed"
+    NOT_FOUND = "not_found"
+
+    def __init__(self, journal_file: str = config.JOURNAL_FILE):
+        self.journal_file = journal_file
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            journal_file, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                kind TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                work_order TEXT NOT NULL DEFAULT '',
+                attempts INTEGER NOT NULL DEFAULT 1,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (kind, item_key)
+            )
+            """)
+        self.outcomes: Dict[tuple[str, str], str] = {
+            (kind, item_key): outcome
+            for kind, item_key, outcome in self.connection.execute(
+                "SELECT kind, item_key, outcome FROM checkpoints"
+            )
+        }
+
+    def is_completed(self, kind: str, item_key: str) -> bool:
+        return self.outcomes.get((kind, item_key)) == self.DONE
+
+    def failed_items(self, kind: str) -> List[str]:
+        with self.lock:
+            return [
+                item_key
+                for (item_kind, item_key), outcome in self.outcomes.items()
+                if item_kind == kind and outcome != self.DONE
+            ]
+
+    def record(self, kind: str, item_key: str, outcome: str, work_order: str = ""):
+        with self.lock:
+            self.connection.execute(
+                """
+                INSERT INTO checkpoints (kind, item_key, outcome, work_order, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, item_key) DO UPDATE SET
+                    outcome = excluded.outcome,
+                    work_order = excluded.work_order,
+                    attempts = attempts + 1,
+                    updated_at = excluded.updated_at
+                """,
+                (kind, item_key, outcome, work_order, datetime.now().isoformat()),
+            )
+            self.outcomes[(kind, item_key)] = outcome
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class SharedWorkQueue:
+
+    PENDING = "pending"
+    LEASED = "leased"
+    FINISHED = (
+        CheckpointJournal.DONE,
+        CheckpointJournal.FAILED,
+        CheckpointJournal.NOT_FOUND,
+    )
+
+    def __init__(
+        self,
+        queue_file: str,
+        owner: str = "",
+        lease_seconds: float = config.QUEUE_LEASE_SECONDS,
+        lock_timeout: float = config.QUEUE_LOCK_TIMEOUT,
+    ):
+        self.queue_file = queue_file
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.reclaimed = 0
+        self.lost = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.heartbeat: Optional[threading.Thread] = None
+        self.connection = sqlite3.connect(
+            queue_file,
+            timeout=lock_timeout,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.connection.execute("PRAGMA journal_mode=DELETE")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS work_items (
+                item_key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                owner TEXT NOT NULL DEFAULT '',
+                lease_until REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                work_order TEXT NOT NULL DEFAULT '',
+                updated_at TEXT NOT NULL
+            )
+            """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS work_items_state "
+            "ON work_items (state, lease_until)"
+        )
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def add(self, item_keys: Iterable[str], batch_size: int = 500) -> int:
+        added = 0
+        batch = []
+        for item_key in item_keys:
+            batch.append(item_key)
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, item_keys: List[str]) -> int:
+        updated_at = datetime.now().isoformat()
+        with self.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO work_items (item_key, state, updated_at) "
+                "VALUES (?, ?, ?)",
+                [(item_key, self.PENDING, updated_at) for item_key in item_keys],
+            )
+            return connection.total_changes - before
+
+    def claim(self, count: int = 1) -> List[str]:
+        if self.heartbeat is None:
+            self.heartbeat = threading.Thread(
+                target=self._heartbeat, name="queue-heartbeat", daemon=True
+            )
+            self.heartbeat.start()
+        now = time.time()
+        with self.transaction() as connection:
+            rows = connection.execute(
+                """
+                SELECT item_key, state FROM work_items
+                WHERE state = ? OR (state = ? AND lease_until < ?)
+                ORDER BY rowid
+                LIMIT ?
+                """,
+                (self.PENDING, self.LEASED, now, count),
+            ).fetchall()
+            connection.executemany(
+                """
+                UPDATE work_items SET
+                    state = ?,
+                    owner = ?,
+                    lease_until = ?,
+                    attempts = attempts + 1,
+                    updated_at = ?
+                WHERE item_key = ?
+                """,
+                [
+                    (
+                        self.LEASED,
+                        self.owner,
+                        now + self.lease_seconds,
+                        datetime.now().isoformat(),
+                        item_key,
+                    )
+                    for item_key, _ in rows
+                ],
+            )
+        self.reclaimed += sum(1 for _, state in rows if state == self.LEASED)
+        return [item_key for item_key, _ in rows]
+
+    def complete(self, item_key: str, outcome: str, work_order: str = "") -> bool:
+        with self.transaction() as connection:
+            updated = connection.execute(
+                """
+                UPDATE work_items SET
+                    state = ?, lease_until = 0, work_order = ?, updated_at = ?
+                WHERE item_key = ? AND owner = ? AND state = ?
+                """,
+                (
+                    outcome,
+                    work_order,
+                    datetime.now().isoformat(),
+                    item_key,
+                    self.owner,
+                    self.LEASED,
+                ),
+            ).rowcount
+        if not updated:
+            self.lost += 1
+        return bool(updated)
+
+    def renew(self) -> int:
+        with self.transaction() as connection:
+            return connection.execute(
+                "UPDATE work_items SET lease_until = ? WHERE state = ? AND owner = ?",
+                (time.time() + self.lease_seconds, self.LEASED, self.owner),
+            ).rowcount
+
+    def _heartbeat(self):
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                self.renew()
+            except sqlite3.Error:
+                continue
+
+    def release(self) -> int:
+        with self.transaction() as connection:
+            return connection.execute(
+                "UPDATE work_items SET state = ?, lease_until = 0 "
+                "WHERE state = ? AND owner = ?",
+                (self.PENDING, self.LEASED, self.owner),
+            ).rowcount
+
+    def requeue_failed(self) -> int:
+        with self.transaction() as connection:
+            return connection.execute(
+                "UPDATE work_items SET state = ? WHERE state IN (?, ?)",
+                (self.PENDING, CheckpointJournal.FAILED, CheckpointJournal.NOT_FOUND),
+            ).rowcount
+
+    def next_expiry(self) -> Optional[float]:
+        with self.lock:
+            (lease_until,) = self.connection.execute(
+                "SELECT MIN(lease_until) FROM work_items WHERE state = ?",
+                (self.LEASED,),
+            ).fetchone()
+        return lease_until
+
+    def report(self) -> dict:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT state, owner, COUNT(*) FROM work_items GROUP BY state, owner"
+            ).fetchall()
+            failed = [
+                item_key
+                for (item_key,) in self.connection.execute(
+                    "SELECT item_key FROM work_items WHERE state IN (?, ?) ORDER BY rowid",
+                    (CheckpointJournal.FAILED, CheckpointJournal.NOT_FOUND),
+                )
+            ]
+
+        states: Dict[str, int] = {}
+        machines: Dict[str, Dict[str, int]] = {}
+        for state, owner, count in rows:
+            states[state] = states.get(state, 0) + count
+            if state in self.FINISHED:
+                machines.setdefault(owner, {})[state] = count
+        return {
+            "queue": self.queue_file,
+            "items": sum(states.values()),
+            "states": states,
+            "machines": machines,
+            "failed": failed,
+        }
+
+    def close(self):
+        self.stopped.set()
+        if self.heartbeat is not None:
+            self.heartbeat.join()
+        with self.lock:
+            self.connection.close()
+
+
+@dataclass
+class GridRow:
+    row_id: str
+    cell_count: int
+    work_order: str
+    status: str
+    order_date: str
+    href: str
+
+
+class GridColumns:
+
+    FIELDS = ("work_order", "link", "status", "date")
+
+    def __init__(self, work_order: int, link: int, status: int, date: int):
+        self.work_order = work_order
+        self.link = link
+        self.status = status
+        self.date = date
+
+    @classmethod
+    def from_config(cls, config: Config) -> "GridColumns":
+        return cls(
+            config.WORK_ORDER_COLUMN,
+            config.LINK_COLUMN,
+            config.STATUS_COLUMN,
+            config.DATE_COLUMN,
+        )
+
+    @staticmethod
+    def normalize(caption: str) -> str:
+        return " ".join(caption.split()).casefold()
+
+    @classmethod
+    def detect(cls, config: Config, headers: List[str]) -> "GridColumns":
+        columns = cls.from_config(config)
+        positions = {}
+        for index, caption in enumerate(headers):
+            positions.setdefault(cls.normalize(caption), index)
+
+        for field_name, captions in (config.GRID_COLUMN_HEADERS or {}).items():
+            if field_name not in cls.FIELDS:
+                continue
+            for caption in captions:
+                index = positions.get(cls.normalize(caption))
+                if index is not None:
+                    setattr(columns, field_name, index)
+                    break
+        return columns
+
+    def moved(self, config: Config) -> Dict[str, tuple[int, int]]:
+        defaults = self.from_config(config)
+        return {
+            field_name: (getattr(defaults, field_name), getattr(self, field_name))
+            for field_name in self.FIELDS
+            if getattr(defaults, field_name) != getattr(self, field_name)
+        }
+
+    def to_script(self) -> dict:
+        return {
+            "workOrder": self.work_order,
+            "link": self.link,
+            "status": self.status,
+            "date": self.date,
+        }
+
+
+class RowPredicate:
+
+    def __init__(self, checks: List[tuple[str, Callable[[GridRow], bool]]]):
+        self.checks = checks
+        self.tests = tuple(check for _, check in checks)
+
+    def __call__(self, row: GridRow) -> bool:
+        for test in self.tests:
+            if not test(row):
+                return False
+        return True
+
+    def reason(self, row: GridRow) -> Optional[str]:
+        for name, check in self.checks:
+            if not check(row):
+                return name
+        return None
+
+
+@dataclass(frozen=True)
+class RowCriteria:
+    date_range: Optional[tuple[Optional[date], Optional[date]]] = None
+    statuses: tuple = ()
+    exclude_statuses: tuple = ()
+    work_order_prefixes: tuple = ()
+    work_order_pattern: str = ""
+    exclude_work_orders: frozenset = frozenset()
+    min_columns: int = 0
+
+    @staticmethod
+    def split(text: Optional[str]) -> tuple:
+        if not text:
+            return ()
+        values = (value.strip() for value in re.split(r"[,;\n]", text))
+        return tuple(dict.fromkeys(value for value in values if value))
+
+    @staticmethod
+    def validate_pattern(pattern: str) -> tuple[bool, str]:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            return False, f"İş emri deseni geçersiz: {e}"
+        return True, ""
+
+    @property
+    def single_status(self) -> Optional[str]:
+        return self.statuses[0] if len(self.statuses) == 1 else None
+
+    @cached_property
+    def predicate(self) -> RowPredicate:
+        return self.compile()
+
+    def compile(self) -> RowPredicate:
+        checks = []
+        if self.min_columns:
+            min_columns = self.min_columns
+            checks.append(("columns", lambda row: row.cell_count >= min_columns))
+
+        if self.exclude_work_orders:
+            excluded = frozenset(code.upper() for code in self.exclude_work_orders)
+            checks.append(
+                ("excluded", lambda row: row.work_order.upper() not in excluded)
+            )
+
+        if self.statuses:
+            statuses = frozenset(status.upper() for status in self.statuses)
+            checks.append(("status", lambda row: row.status.upper() in statuses))
+
+        if self.exclude_statuses:
+            excluded_statuses = frozenset(
+                status.upper() for status in self.exclude_statuses
+            )
+            checks.append(
+                (
+                    "excluded_status",
+                    lambda row: row.status.upper() not in excluded_statuses,
+                )
+            )
+
+        if self.work_order_prefixes:
+            prefixes = tuple(prefix.upper() for prefix in self.work_order_prefixes)
+            checks.append(
+                ("work_order", lambda row: row.work_order.upper().startswith(prefixes))
+            )
+
+        if self.work_order_pattern:
+            search = re.compile(self.work_order_pattern, re.IGNORECASE).search
+            checks.append(
+                ("work_order", lambda row: search(row.work_order) is not None)
+            )
+
+        start_date, end_date = self.date_range or (None, None)
+        if start_date or end_date:
+            parse_date = DateRangeFilter.parse_date
+            lowest = start_date or date.min
+            highest = end_date or date.max
+
+            def in_range(row: GridRow) -> bool:
+                order_date = parse_date(row.order_date)
+                return order_date is not None and lowest <= order_date <= highest
+
+            checks.append(("date", in_range))
+
+        return RowPredicate(checks)
+
+
+class ErrorPageDetector:
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.pattern = re.compile(
+            "|".join(re.escape(keyword) for keyword in config.ERROR_KEYWORDS),
+            re.IGNORECASE,
+        )
+        self.bytes_transferred = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def matches(self, text: str) -> bool:
+        return bool(text) and self.pattern.search(text) is not None
+
+    def count_bytes(self, text: str):
+        with self.lock:
+            self.bytes_transferred += len(text.encode("utf-8"))
+
+    def found(self, detected: bool) -> bool:
+        if detected:
+            with self.lock:
+                self.hits += 1
+        return detected
+
+    def check_response(self, status: int, body: str) -> bool:
+        return self.found(status >= 500 or self.matches(body))
+
+    def check(self, driver) -> bool:
+        raise NotImplementedError
+
+
+class FullPageErrorDetector(ErrorPageDetector):
+
+    def check(self, driver) -> bool:
+        page_source = driver.page_source
+        self.count_bytes(page_source)
+        return self.found(self.matches(page_source))
+
+
+class AspNetErrorDetector(ErrorPageDetector):
+
+    PROBE_SCRIPT = """
+        var selectors = arguments[0], limit = arguments[1];
+        var parts = [document.title];
+        for (var i = 0; i < selectors.length; i++) {
+            var element = document.querySelector(selectors[i]);
+            if (element) { parts.push(element.textContent.slice(0, limit)); }
+        }
+        var navigation = performance.getEntriesByType("navigation")[0];
+        return [navigation && navigation.responseStatus || 0, parts.join("\\n")];
+    """
+
+    def check(self, driver) -> bool:
+        status, text = driver.execute_script(
+            self.PROBE_SCRIPT,
+            self.config.ERROR_CONTAINER_SELECTORS,
+            self.config.ERROR_EXCERPT_LENGTH,
+        )
+        self.count_bytes(text)
+        return self.check_response(status, text)
+
+
+ERROR_DETECTORS = {
+    "aspnet": AspNetErrorDetector,
+    "full_page": FullPageErrorDetector,
+}
+
+
+def create_error_detector(config: Config) -> ErrorPageDetector:
+    detector = ERROR_DETECTORS.get(config.ERROR_DETECTOR)
+    if not detector:
+        raise ValueError(f"Unsupported error detector: {config.ERROR_DETECTOR}")
+    return detector(config)
+
+
+@dataclass
+class StepTiming:
+    name: str
+    failed: bool = False
+
+
+class StepMetrics:
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, tuner: Optional["LatencyTuner"] = None):
+        self.lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = {}
+        self.failures: Dict[str, int] = {}
+        self.tuner = tuner
+        self.local = threading.local()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[StepTiming]:
+        timing = StepTiming(name)
+        started = time.perf_counter()
+        try:
+            yield timing
+        except BaseException as e:
+            timing.failed = True
+            if getattr(self.local, "error", None) is not e:
+                self.local.error = e
+                self.local.step = name
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started, not timing.failed)
+
+    def failed_step(self, error: Optional[BaseException]) -> str:
+        if error is None or getattr(self.local, "error", None) is not error:
+            return ""
+        return self.local.step
+
+    def record(self, name: str, seconds: float, success: bool = True):
+        with self.lock:
+            self.durations.setdefault(name, []).append(seconds)
+            self.failures.setdefault(name, 0)
+            if not success:
+                self.failures[name] += 1
+
+    @staticmethod
+    def quantile(sorted_values: List[float], q: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = max(
+            0, min(len(sorted_values) - 1, int(q * len(sorted_values) + 0.5) - 1)
+        )
+        return sorted_values[index]
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self.lock:
+            items = {name: sorted(values) for name, values in self.durations.items()}
+            failures = dict(self.failures)
+
+        steps = {}
+        for name, values in items.items():
+            total = sum(values)
+            steps[name] = {
+                "count": len(values),
+                "failures": failures.get(name, 0),
+                "total_seconds": round(total, 4),
+                "mean": round(total / len(values), 4),
+                "max": round(values[-1], 4),
+            }
+            for q in self.QUANTILES:
+                steps[name][f"p{int(q * 100)}"] = round(self.quantile(values, q), 4)
+        return steps
+
+    def report(self, summary: dict) -> dict:
+        duration = summary.get("duration_seconds") or 0
+        processed = summary.get("succeeded", 0)
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_seconds": duration,
+            "processed": processed,
+            "failed": summary.get("failed", 0) + summary.get("not_found", 0),
+            "throughput_per_minute": (
+                round(processed * 60 / duration, 2) if duration else 0.0
+            ),
+            "steps": self.snapshot(),
+        }
+
+    def write_json(self, path: str, report: dict):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path: str, report: dict):
+        lines = [
+            "# HELP portal_step_duration_seconds Duration of each portal step.",
+            "# TYPE portal_step_duration_seconds summary",
+        ]
+        for name, step in report["steps"].items():
+            for q in self.QUANTILES:
+                lines.append(
+                    f'portal_step_duration_seconds{{step="{name}",quantile="{q}"}} '
+                    f'{step[f"p{int(q * 100)}"]}'
+                )
+            lines.append(
+                f'portal_step_duration_seconds_sum{{step="{name}"}} {step["total_seconds"]}'
+            )
+            lines.append(
+                f'portal_step_duration_seconds_count{{step="{name}"}} {step["count"]}'
+            )
+
+        lines += [
+            "# HELP portal_step_failures_total Failed executions of each portal step.",
+            "# TYPE portal_step_failures_total counter",
+        ]
+        for name, step in report["steps"].items():
+            lines.append(
+                f'portal_step_failures_total{{step="{name}"}} {step["failures"]}'
+            )
+
+        lines += [
+            "# HELP portal_items_processed_total Items processed successfully in the run.",
+            "# TYPE portal_items_processed_total counter",
+            f"portal_items_processed_total {report['processed']}",
+            "# HELP portal_items_failed_total Items that failed or were not found in the run.",
+            "# TYPE portal_items_failed_total counter",
+            f"portal_items_failed_total {report['failed']}",
+            "# HELP portal_throughput_per_minute Successfully processed items per minute.",
+            "# TYPE portal_throughput_per_minute gauge",
+            f"portal_throughput_per_minute {report['throughput_per_minute']}",
+            "# HELP portal_run_duration_seconds Wall-clock duration of the run.",
+            "# TYPE portal_run_duration_seconds gauge",
+            f"portal_run_duration_seconds {report['duration_seconds']}",
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class LatencyTuner:
+
+    def __init__(self, config: Config, history_file: Optional[str] = None):
+        self.config = config
+        self.history_file = (
+            config.LATENCY_FILE if history_file is None else history_file
+        )
+        self.lock = threading.Lock()
+        self.samples: Dict[str, deque] = {}
+        self.stretch: Dict[str, float] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.load()
+
+    def window(self, name: str) -> deque:
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.config.LATENCY_WINDOW)
+        return self.samples[name]
+
+    def load(self):
+        if not self.history_file or not Path(self.history_file).exists():
+            return
+        try:
+            with open(self.history_file, "r", encoding="utf-8") as f:
+                waits = json.load(f).get("waits", {})
+        except (OSError, ValueError, AttributeError):
+            return
+        for name, values in waits.items():
+            self.window(name).extend(float(value) for value in values)
+
+    def save(self):
+        if not self.history_file:
+            return
+        with self.lock:
+            waits = {
+                name: [round(value, 3) for value in values]
+                for name, values in self.samples.items()
+            }
+        temp_file = f"{self.history_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            updated_at = datetime.now().isoformat(timespec="seconds")
+            json.dump({"updated_at": updated_at, "waits": waits}, f)
+        os.replace(temp_file, self.history_file)
+
+    def observe(self, name: str, seconds: float, success: bool = True):
+        limit = self.timeout(name)
+        with self.lock:
+            stretch = self.stretch.get(name, 1.0)
+            if success:
+                self.window(name).append(seconds)
+                self.stretch[name] = max(1.0, stretch * 0.95)
+            elif seconds >= limit * 0.9:
+                self.stretch[name] = min(
+                    self.config.LATENCY_MAX_STRETCH, stretch * 1.25
+                )
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        with self.lock:
+            values = sorted(self.samples.get(name, ()))
+        if len(values) < self.config.LATENCY_MIN_SAMPLES:
+            return None
+        return StepMetrics.quantile(values, q)
+
+    def timeout(self, name: str) -> float:
+        observed = self.percentile(name, self.config.LATENCY_QUANTILE)
+        if observed is None:
+            return self.config.WAIT_TIMEOUT
+        timeout = (
+            observed * self.config.LATENCY_TIMEOUT_FACTOR * self.stretch.get(name, 1.0)
+        )
+        return min(
+            max(timeout, self.config.LATENCY_MIN_TIMEOUT),
+            self.config.LATENCY_MAX_TIMEOUT,
+        )
+
+    def poll_interval(self, name: str) -> float:
+        typical = self.percentile(name, 0.5)
+        if typical is None:
+            return self.config.POLL_INTERVAL
+        return min(max(typical / 20, 0.05), 0.5)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self.lock:
+            names = sorted(self.samples)
+        return {
+            name: {
+                "samples": len(self.samples[name]),
+                "timeout": round(self.timeout(name), 3),
+                "poll_interval": round(self.poll_interval(name), 3),
+                "timeouts": self.timeouts.get(name, 0),
+            }
+            for name in names
+        }
+
+
+class BasePortalManager:
+
+    def __init__(
+        self,
+        config: Config,
+        log_callback: Optional[Callable[[str], None]] = None,
+        name: str = "",
+        error_logger: Optional[ErrorLogger] = None,
+        metrics: Optional[StepMetrics] = None,
+    ):
+        self.config = config
+        self.error_logger = error_logger or ErrorLogger()
+        self.metrics = metrics or StepMetrics()
+        self.error_detector = create_error_detector(config)
+        self.log_callback = log_callback or print
+        self.name = name
+        self.items_since_start = 0
+        self.next_search: Optional[str] = None
+        self.product_code = ""
+        self.row_started = 0.0
+
+    def log(self, text: str):
+        if self.name:
+            text = f"[{self.name}] {text.lstrip()}"
+        self.log_callback(text)
+
+    def passes_filters(
+        self, row: GridRow, row_index: int, criteria: Optional[RowCriteria] = None
+    ) -> bool:
+        criteria = criteria or RowCriteria(min_columns=self.config.MIN_GRID_COLUMNS)
+        reason = criteria.predicate.reason(row)
+        if reason is None:
+            return True
+
+        if reason == "date":
+            order_date = row.order_date
+            start_date, end_date = criteria.date_range
+            if start_date and end_date:
+                self.log(
+                    f"  Satır {row_index+1} tarih aralığı dışında ({order_date}), atlanıyor."
+                )
+            elif start_date:
+                self.log(
+                    f"  Satır {row_index+1} başlangıç tarihinden önce ({order_date}), atlanıyor."
+                )
+            elif end_date:
+                self.log(
+                    f"  Satır {row_index+1} bitiş tarihinden sonra ({order_date}), atlanıyor."
+                )
+        elif reason in ("status", "excluded_status"):
+            self.log(
+                f"  Satır {row_index+1} durum filtrelendi ({row.status or 'N/A'}), atlanıyor."
+            )
+        elif reason == "work_order":
+            self.log(
+                f"  Satır {row_index+1} iş emri filtresine uymuyor ({row.work_order}), atlanıyor."
+            )
+        elif reason == "excluded":
+            self.log(
+                f"  Satır {row_index+1} hariç tutulan iş emri ({row.work_order}), atlanıyor."
+            )
+        return False
+
+    def detect_columns(self, headers: List[str]) -> GridColumns:
+        columns = GridColumns.detect(self.config, headers)
+        for field_name, (default, index) in columns.moved(self.config).items():
+            self.log(f"Sütun yeri değişmiş: {field_name} {default} -> {index}")
+        return columns
+
+    def failure_artifacts(self) -> tuple[str, Dict[str, bytes]]:
+        return "", {}
+
+    def report_failure(
+        self, work_order: str, step: str = "", error: Optional[BaseException] = None
+    ):
+        self.error_logger.log_error(work_order)
+        diagnostics = self.error_logger.diagnostics
+        if diagnostics is None:
+            return
+
+        try:
+            url, artifacts = self.failure_artifacts()
+        except Exception as e:
+            url, artifacts = "", {}
+            self.log(f"  Tanı bilgisi alınamadı: {e}")
+        message = ""
+        if error is not None:
+            lines = str(error).strip().splitlines()
+            message = type(error).__name__ + (f": {lines[0]}" if lines else "")
+        diagnostics.submit(
+            {
+                "code": self.product_code,
+                "work_order": work_order,
+                "step": step or self.metrics.failed_step(error),
+                "error": message,
+                "duration": (
+                    round(time.perf_counter() - self.row_started, 3)
+                    if self.row_started
+                    else None
+                ),
+                "session": self.name,
+                "engine": self.config.ENGINE,
+                "url": url,
+            },
+            artifacts,
+        )
+
+    def start_driver(self):
+        raise NotImplementedError
+
+    def quit_driver(self):
+        raise NotImplementedError
+
+    def is_alive(self) -> bool:
+        return False
+
+    @contextmanager
+    def create_driver(self):
+        try:
+            self.start_driver()
+            yield
+        finally:
+            self.quit_driver()
+
+    @contextmanager
+    def session(self, keep_warm: bool = False):
+        if keep_warm and self.is_alive():
+            self.log("Açık oturum yeniden kullanılıyor.")
+        else:
+            self.quit_driver()
+            self.start_driver()
+        try:
+            self.navigate_to_start_page()
+            yield
+        finally:
+            if not keep_warm:
+                self.quit_driver()
+
+    def restart(self):
+        self.log("Oturum yanıt vermiyor, yeniden başlatılıyor...")
+        self.quit_driver()
+        self.start_driver()
+        self.navigate_to_start_page()
+
+    def recycle_reason(self) -> Optional[str]:
+        return None
+
+    def observe_wait(self, name: str, seconds: float, success: bool = True):
+        tuner = self.metrics.tuner
+        if tuner:
+            tuner.observe(name, seconds, success)
+
+    def step_timeout(self, name: str) -> float:
+        tuner = self.metrics.tuner
+        return tuner.timeout(name) if tuner else self.config.WAIT_TIMEOUT
+
+    def step_poll_interval(self, name: str) -> float:
+        tuner = self.metrics.tuner
+        return tuner.poll_interval(name) if tuner else self.config.POLL_INTERVAL
+
+    def recycle(self, reason: str):
+        self.log(f"Tarayıcı yenileniyor ({reason})...")
+        with self.metrics.step("recycle"):
+            self.quit_driver()
+            self.start_driver()
+            self.navigate_to_start_page()
+
+    def navigate_to_start_page(self):
+        raise NotImplementedError
+
+    def search_product(self, product_code: str) -> bool:
+        raise NotImplementedError
+
+    def apply_grid_filters(self, criteria: RowCriteria) -> bool:
+        return False
+
+    def snapshot_grid(self) -> List[GridRow]:
+        raise NotImplementedError
+
+    def next_grid_page(self) -> bool:
+        return False
+
+    def refresh_grid(self) -> bool:
+        return False
+
+    def has_error_page(self) -> bool:
+        raise NotImplementedError
+
+    def opens_without_grid(self, row: GridRow) -> bool:
+        return False
+
+    def process_product_row(
+        self, row: GridRow, row_index: int, criteria: Optional[RowCriteria] = None
+    ) -> bool:
+        raise NotImplementedError
+
+
+class PortalPage(HTMLParser):
+
+    SKIPPED_INPUT_TYPES = {"submit", "button", "image", "reset", "file"}
+    HEADERS_ROW_ID = "gridViewurnerede_DXHeadersRow0"
+
+    def __init__(self, url: str, status: int, body: str):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.status = status
+        self.body = body
+        self.title = ""
+        self.form_action = url
+        self.fields: Dict[str, str] = {}
+        self.names_by_id: Dict[str, str] = {}
+        self.values_by_id: Dict[str, str] = {}
+        self.submit_buttons: Dict[str, tuple[str, str]] = {}
+        self.ids: set = set()
+        self.rows: List[list] = []
+        self.headers: List[str] = []
+
+        self._in_title = False
+        self._form_seen = False
+        self._row: Optional[list] = None
+        self._row_depth = 0
+        self._cell: Optional[list] = None
+        self._cell_depth = 0
+        self._textarea: Optional[tuple[str, str]] = None
+        self._select: Optional[tuple[str, str]] = None
+
+        self.feed(body)
+        self.close()
+
+    def handle_starttag(self, tag: str, attrs: list):
+        attributes = {key: value or "" for key, value in attrs}
+        element_id = attributes.get("id")
+        if element_id:
+            self.ids.add(element_id)
+
+        if tag == "title":
+            self._in_title = True
+        elif tag == "form" and not self._form_seen:
+            self._form_seen = True
+            self.form_action = urljoin(self.url, attributes.get("action") or self.url)
+        elif tag == "input":
+            self._handle_input(attributes)
+        elif tag == "textarea" and attributes.get("name"):
+            self._textarea = (attributes["name"], element_id or "")
+            self.fields[attributes["name"]] = ""
+        elif tag == "select" and attributes.get("name"):
+            self._select = (attributes["name"], element_id or "")
+            self.fields.setdefault(attributes["name"], "")
+        elif tag == "option" and self._select and "selected" in attributes:
+            self.fields[self._select[0]] = attributes.get("value", "")
+        elif tag == "tr":
+            if self._row is not None:
+                self._row_depth += 1
+            elif (element_id or "").startswith(
+                "gridViewurnerede_DXDataRow"
+            ) or element_id == self.HEADERS_ROW_ID:
+                self._row = [element_id, [], []]
+                self._row_depth = 0
+        elif tag in ("td", "th") and self._row is not None and self._row_depth == 0:
+            if self._cell is None:
+                self._cell = []
+                self._cell_depth = 0
+                self._row[2].append("")
+            else:
+                self._cell_depth += 1
+        elif tag == "a" and self._cell is not None and not self._row[2][-1]:
+            self._row[2][-1] = attributes.get("href", "")
+
+    def _handle_input(self, attributes: dict):
+        name = attributes.get("name")
+        element_id = attributes.get("id")
+        input_type = attributes.get("type", "text").lower()
+        value = attributes.get("value", "")
+
+        if element_id:
+            self.values_by_id[element_id] = value
+            if name:
+                self.names_by_id[element_id] = name
+        if not name:
+            return
+
+        if input_type == "submit" and element_id:
+            self.submit_buttons[element_id] = (name, value)
+        elif input_type in self.SKIPPED_INPUT_TYPES:
+            return
+        elif input_type in ("checkbox", "radio") and "checked" not in attributes:
+            return
+        else:
+            self.fields[name] = value
+
+    def handle_endtag(self, tag: str):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "textarea":
+            self._textarea = None
+        elif tag == "select":
+            self._select = None
+        elif tag in ("td", "th") and self._cell is not None and self._row_depth == 0:
+            if self._cell_depth:
+                self._cell_depth -= 1
+            else:
+                self._row[1].append(" ".join("".join(self._cell).split()))
+                self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if self._row_depth:
+                self._row_depth -= 1
+            elif self._row[0] == self.HEADERS_ROW_ID:
+                self.headers = self._row[1]
+                self._row = None
+            else:
+                self.rows.append(self._row)
+                self._row = None
+
+    def handle_data(self, data: str):
+        if self._in_title:
+            self.title += data
+        if self._textarea:
+            name, element_id = self._textarea
+            self.fields[name] += data
+            if element_id:
+                self.values_by_id[element_id] = self.fields[name]
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def name_for(self, element_id: str) -> str:
+        if element_id in self.names_by_id:
+            return self.names_by_id[element_id]
+        return re.sub(r"_(CD|I|B)$", "", element_id).replace("_", "$")
+
+    def grid_rows(self, columns: GridColumns) -> List[GridRow]:
+        records = []
+        for row_id, cells, hrefs in self.rows:
+            text = lambda index: cells[index] if index < len(cells) else ""
+            href = hrefs[columns.link] if columns.link < len(hrefs) else ""
+            records.append(
+                GridRow(
+                    row_id,
+                    len(cells),
+                    text(columns.work_order),
+                    text(columns.status),
+                    text(columns.date),
+                    href,
+                )
+            )
+        return records
+
+
+class HttpPortalManager(BasePortalManager):
+
+    def __init__(
+        self,
+        config: Config,
+        log_callback: Optional[Callable[[str], None]] = None,
+        name: str = "",
+        error_logger: Optional[ErrorLogger] = None,
+        metrics: Optional[StepMetrics] = None,
+    ):
+        super().__init__(config, log_callback, name, error_logger, metrics)
+        self.http = None
+        self.cookies: Dict[str, str] = {}
+        self.grid_page: Optional[PortalPage] = None
+        self.columns: Optional[GridColumns] = None
+        self.page: Optional[PortalPage] = None
+
+    def start_driver(self):
+        import urllib3
+
+        with self.metrics.step("driver_start"):
+            self.http = urllib3.PoolManager(
+                maxsize=self.config.HTTP_POOL_SIZE,
+                retries=False,
+                timeout=urllib3.Timeout(total=self.config.WAIT_TIMEOUT),
+            )
+        self.cookies = {}
+
+    def quit_driver(self):
+        if self.http is not None:
+            self.http.clear()
+            self.http = None
+
+    def is_alive(self) -> bool:
+        return self.http is not None
+
+    def request(
+        self, method: str, url: str, fields: Optional[dict] = None
+    ) -> PortalPage:
+        for _ in range(self.config.HTTP_MAX_REDIRECTS + 1):
+            headers = {"User-Agent": "PortalCleaner"}
+            if self.cookies:
+                headers["Cookie"] = "; ".join(
+                    f"{key}={value}" for key, value in self.cookies.items()
+                )
+            body = None
+            if fields is not None:
+                body = urlencode(fields)
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+            response = self.http.request(
+                method, url, body=body, headers=headers, redirect=False
+            )
+            for header in response.headers.getlist("Set-Cookie"):
+                cookie = SimpleCookie()
+                cookie.load(header)
+                self.cookies.update(
+                    {key: morsel.value for key, morsel in cookie.items()}
+                )
+
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if response.status in (301, 302, 303):
+                    method, fields = "GET", None
+                continue
+
+            self.page = PortalPage(
+                url, response.status, response.data.decode("utf-8", errors="replace")
+            )
+            return self.page
+
+        raise ValueError(f"Too many redirects: {url}")
+
+    def post_back(
+        self,
+        page: PortalPage,
+        target_id: str,
+        values: Optional[dict] = None,
+        argument: str = "",
+    ) -> PortalPage:
+        fields = dict(page.fields)
+        for element_id, value in (values or {}).items():
+            fields[page.name_for(element_id)] = value
+
+        if target_id in page.submit_buttons:
+            name, value = page.submit_buttons[target_id]
+            fields[name] = value
+            fields["__EVENTTARGET"] = ""
+        else:
+            fields["__EVENTTARGET"] = page.name_for(target_id)
+        fields["__EVENTARGUMENT"] = argument
+
+        return self.request("POST", page.form_action, fields)
+
+    def navigate_to_start_page(self):
+        with self.metrics.step("start_page"):
+            self.grid_page = self.request("GET", self.config.START_URL)
+        self.columns = None
+
+    def filter_grid(self, editor_id: str, value: str) -> bool:
+        if editor_id not in self.grid_page.ids:
+            return False
+        page = self.post_back(
+            self.grid_page, self.config.HTTP_GRID_EVENT_TARGET, {editor_id: value}
+        )
+        if self.has_error_page():
+            return False
+        self.grid_page = page
+        return True
+
+    def search_product(self, product_code: str) -> bool:
+        with self.metrics.step("search") as step:
+            try:
+                step.failed = not self.filter_grid(
+                    self.config.SEARCH_EDITOR_ID, product_code
+                )
+            except Exception as e:
+                self.log(f"  HTTP hatası: {e}")
+                step.failed = True
+        return not step.failed
+
+    def apply_grid_filters(self, criteria: RowCriteria) -> bool:
+        status_filter = criteria.single_status
+        if not status_filter:
+            return False
+        try:
+            if self.filter_grid(self.config.STATUS_FILTER_EDITOR_ID, status_filter):
+                self.log(f"Portal durum filtresi uygulandı: {status_filter}")
+                return True
+        except Exception as e:
+            self.log(
+                f"Portal filtresi uygulanamadı, istemci tarafında filtrelenecek: {e}"
+            )
+        return False
+
+    def snapshot_grid(self) -> List[GridRow]:
+        if self.grid_page is None:
+            return []
+        if self.columns is None and self.grid_page.headers:
+            self.columns = self.detect_columns(self.grid_page.headers)
+        return self.grid_page.grid_rows(
+            self.columns or GridColumns.from_config(self.config)
+        )
+
+    def page_grid(self, argument: str) -> bool:
+        if self.grid_page is None:
+            return False
+        try:
+            page = self.post_back(
+                self.grid_page, self.config.HTTP_GRID_EVENT_TARGET, argument=argument
+            )
+        except Exception as e:
+            self.log(f"  HTTP hatası: {e}")
+            return False
+        if self.has_error_page():
+            return False
+        self.grid_page = page
+        return True
+
+    def next_grid_page(self) -> bool:
+        before = [row.work_order for row in self.snapshot_grid()]
+        if not self.page_grid(self.config.HTTP_GRID_NEXT_PAGE_ARGUMENT):
+            return False
+        return [row.work_order for row in self.snapshot_grid()] != before
+
+    def refresh_grid(self) -> bool:
+        return self.page_grid(self.config.HTTP_GRID_REFRESH_ARGUMENT)
+
+    def has_error_page(self) -> bool:
+        if self.page is None:
+            return False
+        return self.error_detector.check_response(self.page.status, self.page.body)
+
+    def opens_without_grid(self, row: GridRow) -> bool:
+        return True
+
+    def process_product_row(
+        self, row: GridRow, row_index: int, criteria: Optional[RowCriteria] = None
+    ) -> bool:
+        if not self.passes_filters(row, row_index, criteria):
+            return False
+
+        self.row_started = time.perf_counter()
+        with self.metrics.step("row") as step:
+            step.failed = not self.open_product_row(row, row_index)
+        return not step.failed
+
+    def failure_artifacts(self) -> tuple[str, Dict[str, bytes]]:
+        if self.page is None:
+            return "", {}
+        excerpt = self.page.body[: self.config.DIAGNOSTICS_DOM_CHARS]
+        return self.page.url, {"dom.html": excerpt.encode("utf-8")}
+
+    def open_product_row(self, row: GridRow, row_index: int) -> bool:
+        try:
+            href = row.href.strip()
+            if not href or href.startswith(("#", "javascript:")):
+                self.log(f"  Satır {row_index+1} bağlantısı HTTP modunda açılamıyor.")
+                self.report_failure(row.work_order, "open_page")
+                return False
+
+            with self.metrics.step("open_page"):
+                self.request("GET", urljoin(self.grid_page.url, href))
+            with self.metrics.step("error_check") as step:
+                step.failed = self.has_error_page()
+            if step.failed:
+                self.report_failure(row.work_order, "error_check")
+                return False
+
+            return self.process_product_page(row.work_order, row_index)
+
+        except Exception:
+            return False
+
+    def process_product_page(self, work_order: str, row_index: int) -> bool:
+        try:
+            page = self.page
+            if "Miktar_I" not in page.ids:
+                self.report_failure(work_order, "read_quantity")
+                return False
+            quantity = page.values_by_id.get("Miktar_I", "")
+
+            if "Baslat" in page.ids:
+                with self.metrics.step("baslat") as step:
+                    page = self.post_back(page, "Baslat")
+                    if "btnUpdatebaslat" in page.ids and not self.has_error_page():
+                        page = self.post_back(page, "btnUpdatebaslat")
+                    step.failed = self.has_error_page()
+
+            if self.has_error_page() or "Bitir" not in page.ids:
+                self.report_failure(work_order, "baslat")
+                return False
+            with self.metrics.step("bitir") as step:
+                page = self.post_back(page, "Bitir")
+                step.failed = self.has_error_page()
+
+            if self.has_error_page() or not {"Brut_I", "btnUpdate_CD"} <= page.ids:
+                self.report_failure(work_order, "bitir")
+                return False
+            with self.metrics.step("update") as step:
+                self.post_back(page, "btnUpdate_CD", {"Brut_I": quantity})
+                step.failed = self.has_error_page()
+
+            if step.failed:
+                self.report_failure(work_order, "update")
+                return False
+
+            return True
+
+        except Exception as e:
+            self.report_failure(work_order, error=e)
+            return False
+
+
+def load_selenium_engine():
+    from portal_selenium import WebDriverManager
+
+    return WebDriverManager
+
+
+def load_http_engine():
+    return HttpPortalManager
+
+
+PORTAL_ENGINES = {
+    "selenium": load_selenium_engine,
+    "http": load_http_engine,
+}
+
+
+def create_portal_manager(
+    config: Config,
+    log_callback: Optional[Callable[[str], None]] = None,
+    name: str = "",
+    error_logger: Optional[ErrorLogger] = None,
+    metrics: Optional[StepMetrics] = None,
+) -> BasePortalManager:
+    load_engine = PORTAL_ENGINES.get(config.ENGINE)
+    if not load_engine:
+        raise ValueError(f"Unsupported engine: {config.ENGINE}")
+    return load_engine()(config, log_callback, name, error_logger, metrics)
+
+
+@dataclass
+class LogEvent:
+    timestamp: float
+    text: str
+    level: int = logging.INFO
+
+    def format(self) -> str:
+        return (
+            f"{time.strftime('%H:%M:%S', time.localtime(self.timestamp))} - {self.text}"
+        )
+
+
+def create_file_logger(log_file: str = config.LOG_FILE) -> logging.Logger:
+    logger = logging.getLogger("portal_cleaner")
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            log_file,
+            maxBytes=config.LOG_FILE_MAX_BYTES,
+            backupCount=config.LOG_FILE_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class ProductCodeWorkerPool:
+
+    def __init__(
+        self,
+        config: Config,
+        worker_count: int,
+        log_callback: Callable[[str], None],
+        error_logger: Optional[ErrorLogger] = None,
+        metrics: Optional[StepMetrics] = None,
+        manager_factory: Optional[Callable[[str], BasePortalManager]] = None,
+        keep_warm: bool = False,
+        on_error: Optional[Callable[[BasePortalManager, str, Exception], None]] = None,
+    ):
+        self.config = config
+        self.worker_count = max(1, worker_count)
+        self.log_callback = log_callback
+        self.error_logger = error_logger or ErrorLogger()
+        self.metrics = metrics or StepMetrics()
+        self.manager_factory = manager_factory
+        self.keep_warm = keep_warm
+        self.on_error = on_error
+        self.work_queue: "queue.Queue[Optional[tuple[int, str]]]" = queue.Queue(
+            maxsize=self.worker_count * 2
+        )
+        self.lock = threading.Lock()
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: List[str] = []
+
+    def run(
+        self,
+        product_codes: Iterable[str],
+        process_code: Callable[[BasePortalManager, int, str], bool],
+        should_continue: Callable[[], bool],
+    ) -> tuple[int, int]:
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(f"T{worker_id}", process_code, should_continue),
+                daemon=True,
+            )
+            for worker_id in range(1, self.worker_count + 1)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for item in enumerate(product_codes, start=1):
+            if not self._put(item, threads, should_continue):
+                break
+        for _ in threads:
+            self._put(None, threads, lambda: True)
+
+        for thread in threads:
+            thread.join()
+
+        return self.succeeded, self.failed
+
+    def _put(
+        self,
+        item: Optional[tuple[int, str]],
+        threads: List[threading.Thread],
+        should_continue: Callable[[], bool],
+    ) -> bool:
+        while should_continue() and any(thread.is_alive() for thread in threads):
+            try:
+                self.work_queue.put(item, timeout=self.config.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(
+        self,
+        name: str,
+        process_code: Callable[[BasePortalManager, int, str], bool],
+        should_continue: Callable[[], bool],
+    ):
+        if self.manager_factory:
+            manager = self.manager_factory(name)
+        else:
+            manager = create_portal_manager(
+                self.config, self.log_callback, name, self.error_logger, self.metrics
+            )
+        try:
+            with manager.session(self.keep_warm):
+                manager.log("Oturum hazır.")
+
+                while should_continue():
+                    try:
+                        item = self.work_queue.get(timeout=self.config.POLL_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    if item is None:
+                        break
+
+                    index, product_code = item
+                    try:
+                        success = process_code(manager, index, product_code)
+                    except Exception as e:
+                        success = False
+                        manager.log(f"  {product_code} işlenirken hata: {e}")
+                        if self.on_error:
+                            self.on_error(manager, product_code, e)
+                    with self.lock:
+                        if success:
+                            self.succeeded += 1
+                        else:
+                            self.failed += 1
+
+                    if not success and should_continue() and not manager.is_alive():
+                        manager.restart()
+
+        except Exception as e:
+            manager.log(f"Oturum hatası, çalışan durduruluyor: {e}")
+            with self.lock:
+                self.errors.append(f"{name}: {e}")
+
+
+class RateController:
+
+    def __init__(
+        self,
+        config: Config,
+        max_concurrency: int = 1,
+        log_callback: Optional[Callable[[str], None]] = None,
+    ):
+        self.config = config
+        self.enabled = config.RATE_CONTROL
+        self.max_concurrency = max(1, max_concurrency)
+        self.log = log_callback or print
+        self.condition = threading.Condition()
+        self.limit = self.max_concurrency
+        self.active = 0
+        self.interval = config.RATE_MIN_INTERVAL
+        self.next_slot = 0.0
+        self.healthy_streak = 0
+        self.window: deque = deque(maxlen=config.CIRCUIT_WINDOW)
+        self.open_until = 0.0
+        self.half_open = False
+        self.trips = 0
+        self.total_trips = 0
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(
+            self.config.RETRY_BACKOFF_MAX,
+            self.config.RETRY_BACKOFF_BASE * 2 ** max(0, attempt),
+        )
+        return random.uniform(ceiling / 2, ceiling)
+
+    def acquire(self, should_continue: Callable[[], bool]) -> bool:
+        if not self.enabled:
+            return should_continue()
+
+        with self.condition:
+            while should_continue():
+                now = time.monotonic()
+                if now < self.open_until:
+                    wait = self.open_until - now
+                elif self.active >= self.limit:
+                    wait = self.config.POLL_INTERVAL
+                elif now < self.next_slot:
+                    wait = self.next_slot - now
+                else:
+                    if self.open_until:
+                        self.open_until = 0.0
+                        self.half_open = True
+                        self.limit = 1
+                        self.log("Devre kesici yarı açık, deneme isteği gönderiliyor.")
+                    self.active += 1
+                    self.next_slot = now + self.interval
+                    return True
+                self.condition.wait(min(wait, self.config.POLL_INTERVAL))
+        return False
+
+    def relaxed(self) -> bool:
+        if not self.enabled:
+            return True
+        with self.condition:
+            return (
+                not self.half_open
+                and time.monotonic() >= self.open_until
+                and self.interval <= self.config.RATE_MIN_INTERVAL
+            )
+
+    def release(self, success: bool, latency: float, server_error: bool):
+        if not self.enabled:
+            return
+
+        with self.condition:
+            self.active = max(0, self.active - 1)
+            congested = server_error or latency > self.config.RATE_TARGET_LATENCY
+            self.window.append(server_error)
+
+            if self.half_open:
+                self.half_open = False
+                if server_error:
+                    self.trip()
+                else:
+                    self.trips = 0
+                    self.log("Devre kesici kapandı, işleme devam ediliyor.")
+            elif congested:
+                self.slow_down()
+                errors = sum(self.window)
+                if (
+                    len(self.window) >= self.config.CIRCUIT_MIN_SAMPLES
+                    and errors / len(self.window) >= self.config.CIRCUIT_ERROR_RATIO
+                ):
+                    self.trip()
+            elif success:
+                self.speed_up()
+
+            self.condition.notify_all()
+
+    def slow_down(self):
+        self.healthy_streak = 0
+        self.interval = min(
+            self.config.RATE_MAX_INTERVAL,
+            max(self.interval * 2, self.config.RATE_INTERVAL_STEP),
+        )
+        if self.limit > 1:
+            self.limit = max(1, self.limit // 2)
+            self.log(
+                f"Portal yavaşladı, eşzamanlılık {self.limit}, "
+                f"istek aralığı {self.interval:.1f} sn."
+            )
+
+    def speed_up(self):
+        interval = self.interval * self.config.RATE_RECOVERY_FACTOR
+        if interval < self.config.RATE_INTERVAL_STEP:
+            interval = self.config.RATE_MIN_INTERVAL
+        self.interval = max(self.config.RATE_MIN_INTERVAL, interval)
+        self.healthy_streak += 1
+        if self.limit < self.max_concurrency and self.healthy_streak >= self.limit * 2:
+            self.healthy_streak = 0
+            self.limit += 1
+            self.log(f"Portal rahatladı, eşzamanlılık {self.limit}.")
+
+    def trip(self):
+        cooldown = min(
+            self.config.CIRCUIT_MAX_COOLDOWN,
+            self.config.CIRCUIT_COOLDOWN * 2**self.trips,
+        )
+        cooldown = random.uniform(cooldown * 0.8, cooldown)
+        self.trips += 1
+        self.total_trips += 1
+        self.open_until = time.monotonic() + cooldown
+        self.limit = 1
+        self.window.clear()
+        self.log(
+            f"Sunucu hataları arttı, devre kesici açıldı: tüm çalışanlar "
+            f"{cooldown:.0f} sn bekliyor."
+        )
+
+
+class GridCursor:
+
+    def __init__(
+        self,
+        manager: BasePortalManager,
+        should_continue: Callable[[], bool] = lambda: True,
+    ):
+        self.manager = manager
+        self.should_continue = should_continue
+        self.seen: set = set()
+        self.pages = 0
+        self.dirty = False
+
+    @staticmethod
+    def key(row: GridRow) -> str:
+        return row.work_order or row.row_id
+
+    def __iter__(self) -> Iterator[GridRow]:
+        rows = self.manager.snapshot_grid()
+        self.pages = 1 if rows else 0
+        while self.should_continue():
+            fresh = [row for row in rows if self.key(row) not in self.seen]
+            for row in fresh:
+                if not self.should_continue():
+                    return
+                self.seen.add(self.key(row))
+                yield row
+
+            if self.dirty and self.manager.refresh_grid():
+                self.dirty = False
+                rows = self.manager.snapshot_grid()
+                if any(self.key(row) not in self.seen for row in rows):
+                    continue
+
+            if not self.manager.next_grid_page():
+                return
+            self.dirty = False
+            self.pages += 1
+            rows = self.manager.snapshot_grid()
+
+
+class WorkOrderIndex:
+
+    def __init__(self, contains: bool = True):
+        self.contains = contains
+        self.rows: Dict[str, List[GridRow]] = {}
+        self.pages = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: GridRow):
+        self.rows.setdefault(row.work_order.upper(), []).append(row)
+
+    @classmethod
+    def build(
+        cls,
+        manager: BasePortalManager,
+        should_continue: Callable[[], bool] = lambda: True,
+        contains: bool = True,
+    ) -> "WorkOrderIndex":
+        index = cls(contains)
+        cursor = GridCursor(manager, should_continue)
+        for row in cursor:
+            index.add(row)
+        index.pages = cursor.pages
+        return index
+
+    def lookup(self, product_code: str) -> List[GridRow]:
+        key = product_code.strip().upper()
+        rows = self.rows.get(key)
+        if rows is not None or not self.contains or not key:
+            return list(rows or [])
+        return [
+            row
+            for work_order, rows in self.rows.items()
+            if key in work_order
+            for row in rows
+        ]
+
+
+@dataclass
+class RunOptions:
+    date_range: Optional[tuple[Optional[date], Optional[date]]] = None
+    status_filter: Optional[str] = None
+    exclude_statuses: Optional[str] = None
+    work_order_prefix: Optional[str] = None
+    work_order_pattern: Optional[str] = None
+    exclude_work_orders: Optional[List[str]] = None
+    product_file: Optional[str] = None
+    product_codes: Optional[List[str]] = None
+    queue_file: Optional[str] = None
+    use_index: bool = False
+    worker_count: int = 1
+    resume: bool = False
+    retry_failures: bool = False
+
+    @property
+    def product_mode(self) -> bool:
+        return (
+            self.product_file is not None
+            or self.product_codes is not None
+            or self.queue_file is not None
+        )
+
+    def row_criteria(self, min_columns: int = 0) -> RowCriteria:
+        date_range = (
+            self.date_range if self.date_range and any(self.date_range) else None
+        )
+        return RowCriteria(
+            date_range=date_range,
+            statuses=RowCriteria.split(self.status_filter),
+            exclude_statuses=RowCriteria.split(self.exclude_statuses),
+            work_order_prefixes=RowCriteria.split(self.work_order_prefix),
+            work_order_pattern=self.work_order_pattern or "",
+            exclude_work_orders=frozenset(self.exclude_work_orders or ()),
+            min_columns=min_columns,
+        )
+
+    def describe(self) -> str:
+        filters = []
+        if self.date_range:
+            start_date, end_date = self.date_range
+            start_text = start_date.strftime("%d.%m.%Y") if start_date else ""
+            end_text = end_date.strftime("%d.%m.%Y") if end_date else ""
+            filters.append(f"Tarih: {start_text} - {end_text}")
+
+        if self.status_filter:
+            filters.append(f"Durum: {self.status_filter}")
+        if self.exclude_statuses:
+            filters.append(f"Hariç durum: {self.exclude_statuses}")
+        if self.work_order_prefix:
+            filters.append(f"İş emri öneki: {self.work_order_prefix}")
+        if self.work_order_pattern:
+            filters.append(f"İş emri deseni: {self.work_order_pattern}")
+        if self.exclude_work_orders:
+            filters.append(f"Hariç: {len(self.exclude_work_orders)} iş emri")
+
+        if self.product_codes is not None:
+            filters.append(f"Ürün Kodu: {len(self.product_codes)} kod")
+        elif self.product_file is not None:
+            filters.append(f"Ürün Kodu: {Path(self.product_file).name}")
+        if self.queue_file is not None:
+            filters.append(f"Paylaşımlı kuyruk: {Path(self.queue_file).name}")
+        if self.product_mode and self.use_index:
+            filters.append("Tablo dizini")
+        if self.product_mode and self.worker_count > 1:
+            filters.append(f"{self.worker_count} paralel tarayıcı")
+
+        if not filters:
+            filters.append("Tüm iş emirleri")
+
+        return " | ".join(filters)
+
+
+@dataclass
+class RunSummary:
+    mode: str
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    not_found: int = 0
+    skipped: int = 0
+    filtered: int = 0
+    duration_seconds: float = 0.0
+    error_check_bytes: int = 0
+    circuit_trips: int = 0
+    ingest: Optional[IngestStats] = None
+    queue: Optional[dict] = None
+    stopped: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def close_sessions(sessions: Dict[str, BasePortalManager]):
+    for manager in sessions.values():
+        try:
+            manager.quit_driver()
+        except Exception:
+            pass
+    sessions.clear()
+
+
+class BatchRunner:
+
+    def __init__(
+        self,
+        config: Config,
+        options: RunOptions,
+        log_callback: Callable[[str], None],
+        error_logger: Optional[ErrorLogger] = None,
+        journal: Optional[CheckpointJournal] = None,
+        sessions: Optional[Dict[str, BasePortalManager]] = None,
+    ):
+        self.config = config
+        self.options = options
+        self.log = log_callback
+        self.error_logger = error_logger or ErrorLogger(
+            config.ERROR_FILE, DiagnosticsSink.from_config(config)
+        )
+        self.journal = journal or CheckpointJournal(config.JOURNAL_FILE)
+        self.keep_warm = config.KEEP_SESSION_WARM and sessions is not None
+        self.sessions = {} if sessions is None else sessions
+        self.error_baselines: Dict[str, int] = {}
+        self.metrics = StepMetrics(
+            LatencyTuner(config) if config.LATENCY_TUNING else None
+        )
+        self.rate = RateController(
+            config, options.worker_count if options.product_mode else 1, log_callback
+        )
+        self.criteria = options.row_criteria(config.MIN_GRID_COLUMNS)
+        self.work_queue: Optional[SharedWorkQueue] = None
+        self.index: Optional[WorkOrderIndex] = None
+        self.code_total: Optional[int] = None
+        self.is_running = False
+        self.lock = threading.Lock()
+        self.summary = RunSummary(
+            mode="product_codes" if options.product_mode else "all_orders"
+        )
+
+    def stop(self):
+        self.is_running = False
+
+    def get_manager(self, name: str = "") -> BasePortalManager:
+        manager = self.sessions.get(name)
+        if manager is None:
+            manager = create_portal_manager(
+                self.config, self.log, name, self.error_logger, self.metrics
+            )
+            self.sessions[name] = manager
+        manager.metrics = self.metrics
+        self.error_baselines.setdefault(name, manager.error_detector.bytes_transferred)
+        return manager
+
+    def ensure_alive(self, manager: BasePortalManager):
+        if not self.is_running or manager.is_alive():
+            return
+        try:
+            manager.restart()
+        except Exception as e:
+            manager.log(f"Oturum yeniden başlatılamadı: {e}")
+
+    def product_code_source(self) -> Iterable[str]:
+        if self.options.queue_file is not None:
+            self.work_queue = SharedWorkQueue(
+                self.options.queue_file,
+                self.config.QUEUE_OWNER,
+                self.config.QUEUE_LEASE_SECONDS,
+                self.config.QUEUE_LOCK_TIMEOUT,
+            )
+            self.log(f"Paylaşımlı kuyruk açıldı ({self.work_queue.owner}).")
+            return self.queued_product_codes()
+
+        if self.options.product_codes is None:
+            return self.stream_product_codes(self.options.product_file)
+
+        codes = [
+            code
+            for code in self.options.product_codes
+            if not (self.options.resume and self.journal.is_completed("code", code))
+        ]
+        self.summary.skipped = len(self.options.product_codes) - len(codes)
+        self.code_total = len(codes)
+        return codes
+
+    def stream_product_codes(self, file_path: str) -> Iterator[str]:
+        stats = IngestStats()
+        self.summary.ingest = stats
+        skipped = 0
+        for code in FileProcessor.iter_codes(file_path, stats):
+            if self.options.resume and self.journal.is_completed("code", code):
+                skipped += 1
+                continue
+            yield code
+
+        self.code_total = stats.unique - skipped
+        self.summary.skipped = skipped
+        self.log(
+            f"Dosya okundu: {stats.total} satır, {stats.unique} benzersiz kod, "
+            f"{stats.duplicates} tekrar, {stats.blank} boş satır."
+        )
+        if skipped:
+            self.log(f"{skipped} kod daha önce tamamlanmış, atlandı.")
+        if not stats.unique:
+            self.log("Dosyada geçerli ürün kodu bulunamadı!")
+
+    def queued_product_codes(self) -> Iterator[str]:
+        work_queue = self.work_queue
+        if self.options.product_codes is not None:
+            added = work_queue.add(self.options.product_codes)
+            self.log(f"Kuyruğa {added} yeni kod eklendi.")
+        elif self.options.product_file is not None:
+            stats = IngestStats()
+            self.summary.ingest = stats
+            added = work_queue.add(
+                FileProcessor.iter_codes(self.options.product_file, stats)
+            )
+            self.log(
+                f"Dosya okundu: {stats.unique} benzersiz kod, kuyruğa {added} yeni kod eklendi."
+            )
+        if self.options.retry_failures:
+            requeued = work_queue.requeue_failed()
+            self.log(f"{requeued} başarısız kod kuyruğa geri alındı.")
+
+        waiting = False
+        while self.is_running:
+            product_codes = work_queue.claim(self.options.worker_count)
+            if product_codes:
+                waiting = False
+                yield from product_codes
+                continue
+
+            if work_queue.next_expiry() is None:
+                break
+            if not waiting:
+                waiting = True
+                self.log("Kuyrukta boş kod yok, açık kiraların bitmesi bekleniyor...")
+            deadline = time.time() + self.config.QUEUE_POLL_INTERVAL
+            while self.is_running and time.time() < deadline:
+                time.sleep(self.config.POLL_INTERVAL)
+
+    def finish_queue(self):
+        work_queue = self.work_queue
+        self.work_queue = None
+        try:
+            released = work_queue.release()
+            if released:
+                self.log(f"{released} kiralık kod kuyruğa geri bırakıldı.")
+            if work_queue.reclaimed:
+                self.log(
+                    f"Süresi dolan {work_queue.reclaimed} kira başka bilgisayardan devralındı."
+                )
+            if work_queue.lost:
+                self.log(
+                    f"{work_queue.lost} kodun kirası işlenirken başka bilgisayara geçti."
+                )
+            report = work_queue.report()
+            self.summary.queue = report
+            states = report["states"]
+            open_items = states.get(SharedWorkQueue.PENDING, 0) + states.get(
+                SharedWorkQueue.LEASED, 0
+            )
+            self.log(
+                f"Kuyruk: {report['items']} kod, "
+                f"{states.get(CheckpointJournal.DONE, 0)} tamamlandı, "
+                f"{states.get(CheckpointJournal.FAILED, 0)} başarısız, "
+                f"{states.get(CheckpointJournal.NOT_FOUND, 0)} bulunamadı, "
+                f"{open_items} bekliyor ({len(report['machines'])} bilgisayar)."
+            )
+        except sqlite3.Error as e:
+            self.log(f"Kuyruk raporu alınamadı: {e}")
+        finally:
+            work_queue.close()
+
+    def process_product_code(
+        self, manager: BasePortalManager, index: int, product_code: str
+    ) -> bool:
+        progress = f"{index}/{self.code_total}" if self.code_total else str(index)
+        manager.log(f"\n[{progress}] İş emri aratılıyor: {product_code}")
+        manager.product_code = product_code
+
+        rows = None
+        if self.index is not None:
+            indexed = self.index.lookup(product_code)
+            rows = [row for row in indexed if self.criteria.predicate(row)]
+            if not indexed:
+                manager.log(f"  {product_code} tablo dizininde yok, portal aranmadı")
+                self.error_logger.log_error(product_code)
+            elif not rows:
+                manager.log(f"  {product_code} için filtrelere uyan satır yok")
+        success = False
+        not_found = rows == []
+        work_order = ""
+
+        for attempt in range(0 if not_found else self.config.MAX_RETRIES):
+            if not self.rate.acquire(lambda: self.is_running):
+                break
+
+            if attempt > 0:
+                manager.log(f"  Yeniden deneme #{attempt + 1}")
+
+            hits = manager.error_detector.hits
+            started = time.perf_counter()
+            try:
+                success, not_found, work_order = self.try_product_code(
+                    manager, product_code, rows
+                )
+            except Exception as e:
+                manager.log(f"  Oturum hatası: {e}")
+            finally:
+                self.rate.release(
+                    success or not_found,
+                    time.perf_counter() - started,
+                    manager.error_detector.hits > hits,
+                )
+
+            if success or not_found:
+                break
+
+            self.ensure_alive(manager)
+            if attempt + 1 < self.config.MAX_RETRIES:
+                time.sleep(self.rate.backoff(attempt))
+
+        if not success:
+            manager.log(f"  {product_code} için işlem başarısız")
+
+        if self.is_running or success:
+            if success:
+                outcome = CheckpointJournal.DONE
+            elif not_found:
+                outcome = CheckpointJournal.NOT_FOUND
+            else:
+                outcome = CheckpointJournal.FAILED
+            self.record_code(manager, product_code, outcome, work_order)
+
+        manager.log("  Yeni ürüne geçiliyor.\n")
+        if rows != []:
+            self.after_item(manager)
+            if self.config.USE_FIXED_DELAYS:
+                time.sleep(self.config.SEARCH_DELAY)
+        return success
+
+    def record_code(
+        self,
+        manager: BasePortalManager,
+        product_code: str,
+        outcome: str,
+        work_order: str = "",
+    ):
+        self.journal.record("code", product_code, outcome, work_order)
+        if self.work_queue:
+            try:
+                if not self.work_queue.complete(product_code, outcome, work_order):
+                    manager.log(
+                        f"  {product_code} kirası başka bilgisayara geçmiş, "
+                        f"sonuç kuyruğa yazılmadı"
+                    )
+            except sqlite3.Error as e:
+                manager.log(f"  Kuyruk güncellenemedi: {e}")
+
+        with self.lock:
+            self.summary.total += 1
+            if outcome == CheckpointJournal.DONE:
+                self.summary.succeeded += 1
+            elif outcome == CheckpointJournal.NOT_FOUND:
+                self.summary.not_found += 1
+            else:
+                self.summary.failed += 1
+
+    def fail_product_code(
+        self, manager: BasePortalManager, product_code: str, error: Exception
+    ):
+        try:
+            self.record_code(manager, product_code, CheckpointJournal.FAILED)
+        except Exception as e:
+            manager.log(f"  {product_code} başarısız olarak kaydedilemedi: {e}")
+
+    def after_item(
+        self, manager: BasePortalManager, cursor: Optional[GridCursor] = None
+    ):
+        manager.items_since_start += 1
+        reason = manager.recycle_reason()
+        if reason is None or not self.is_running:
+            return
+        try:
+            manager.recycle(reason)
+            if cursor is not None:
+                self.restore_grid(manager, cursor)
+        except Exception as e:
+            manager.log(f"Tarayıcı yenilenemedi: {e}")
+            self.ensure_alive(manager)
+
+    def restore_grid(self, manager: BasePortalManager, cursor: GridCursor):
+        if self.config.PUSH_DOWN_FILTERS:
+            manager.apply_grid_filters(self.criteria)
+        for _ in range(cursor.pages - 1):
+            if not manager.next_grid_page():
+                break
+        cursor.dirty = True
+        manager.log(f"Tablo {cursor.pages}. sayfaya geri getirildi.")
+
+    def try_product_code(
+        self,
+        manager: BasePortalManager,
+        product_code: str,
+        rows: Optional[List[GridRow]] = None,
+    ) -> tuple[bool, bool, str]:
+        if rows and all(manager.opens_without_grid(row) for row in rows):
+            manager.log(f"  {len(rows)} satır dizinde bulundu, işleniyor...")
+        else:
+            if not manager.search_product(product_code):
+                return False, False, ""
+
+            rows = manager.snapshot_grid()
+            if not rows:
+                manager.log(f"  {product_code} için sonuç bulunamadı")
+                self.error_logger.log_error(product_code)
+                return False, True, ""
+
+            manager.log(f"  {len(rows)} satır bulundu, işleniyor...")
+
+        for row_index, row in enumerate(rows):
+            if manager.process_product_row(row, row_index, self.criteria):
+                return True, False, row.work_order
+        return False, False, ""
+
+    def load_index(self, manager: BasePortalManager):
+        started = time.perf_counter()
+        self.log("Tablo dizini oluşturuluyor...")
+        with self.metrics.step("index"):
+            self.index = WorkOrderIndex.build(
+                manager, lambda: self.is_running, self.config.PRODUCT_INDEX_CONTAINS
+            )
+        self.log(
+            f"Tablo dizini hazır: {self.index.pages} sayfada {len(self.index)} iş emri "
+            f"({time.perf_counter() - started:.1f} sn)."
+        )
+
+    def run_worker_pool(self, product_codes: Iterable[str]):
+        worker_count = min(
+            self.options.worker_count, self.code_total or self.options.worker_count
+        )
+        self.log(f"{worker_count} paralel tarayıcı başlatılıyor...")
+
+        pool = ProductCodeWorkerPool(
+            self.config,
+            worker_count,
+            self.log,
+            self.error_logger,
+            self.metrics,
+            self.get_manager,
+            self.keep_warm,
+            self.fail_product_code,
+        )
+        succeeded, failed = pool.run(
+            product_codes, self.process_product_code, lambda: self.is_running
+        )
+        self.log(f"Toplam {succeeded} ürün işlendi, {failed} ürün başarısız.")
+        if self.is_running and len(pool.errors) == pool.worker_count:
+            raise RuntimeError(
+                f"Hiçbir çalışan oturumu açık kalmadı ({pool.errors[-1]})"
+            )
+
+    @staticmethod
+    def lookahead(items: Iterable[str]) -> Iterator[tuple[str, Optional[str]]]:
+        items = iter(items)
+        current = next(items, None)
+        while current is not None:
+            upcoming = next(items, None)
+            yield current, upcoming
+            current = upcoming
+
+    def run_product_codes(
+        self, manager: BasePortalManager, product_codes: Iterable[str]
+    ):
+        if (
+            self.config.PIPELINE_SEARCH
+            and self.index is None
+            and self.work_queue is None
+        ):
+            pairs = self.lookahead(product_codes)
+        else:
+            pairs = ((product_code, None) for product_code in product_codes)
+
+        for index, (product_code, upcoming) in enumerate(pairs, start=1):
+            if not self.is_running:
+                break
+
+            manager.next_search = upcoming if upcoming and self.rate.relaxed() else None
+            self.process_product_code(manager, index, product_code)
+        manager.next_search = None
+
+    def run_all_orders(self, manager: BasePortalManager):
+        self.log("Tüm iş emirleri taranıyor...")
+        manager.product_code = ""
+
+        if self.config.PUSH_DOWN_FILTERS:
+            manager.apply_grid_filters(self.criteria)
+
+        retry_failures = set()
+        if self.options.retry_failures:
+            retry_failures = set(self.journal.failed_items("work_order"))
+
+        matches = self.criteria.predicate
+        cursor = GridCursor(manager, lambda: self.is_running)
+        for row_index, row in enumerate(cursor):
+            if (
+                self.options.resume
+                and self.journal.is_completed("work_order", row.work_order)
+            ) or (self.options.retry_failures and row.work_order not in retry_failures):
+                self.summary.skipped += 1
+                continue
+
+            if not matches(row):
+                manager.passes_filters(row, row_index, self.criteria)
+                self.summary.filtered += 1
+                continue
+
+            if not self.rate.acquire(lambda: self.is_running):
+                break
+            hits = manager.error_detector.hits
+            started = time.perf_counter()
+            success = False
+            try:
+                success = manager.process_product_row(row, row_index, self.criteria)
+            finally:
+                self.rate.release(
+                    success,
+                    time.perf_counter() - started,
+                    manager.error_detector.hits > hits,
+                )
+
+            cursor.dirty = True
+            self.summary.total += 1
+            if success:
+                self.summary.succeeded += 1
+                self.journal.record(
+                    "work_order", row.work_order, CheckpointJournal.DONE
+                )
+            else:
+                self.summary.failed += 1
+                self.journal.record(
+                    "work_order", row.work_order, CheckpointJournal.FAILED
+                )
+                self.ensure_alive(manager)
+            self.after_item(manager, cursor)
+
+        if not cursor.seen:
+            self.log("Hiç satır bulunamadı!")
+            return
+
+        self.log(f"{cursor.pages} sayfada {len(cursor.seen)} satır tarandı.")
+        if self.summary.skipped:
+            self.log(f"{self.summary.skipped} satır kayıt defterine göre atlandı.")
+
+        self.log(f"Toplam {self.summary.succeeded} satır işlendi.")
+
+    def run(self) -> RunSummary:
+        started = time.perf_counter()
+        self.is_running = True
+        try:
+            product_codes = (
+                self.product_code_source() if self.options.product_mode else None
+            )
+            if product_codes is not None and self.options.worker_count > 1:
+                if self.options.use_index:
+                    manager = self.get_manager()
+                    with manager.session(self.keep_warm):
+                        self.load_index(manager)
+                self.run_worker_pool(product_codes)
+                self.report_error_check_bytes()
+                self.log("\nTüm işlemler tamamlandı.")
+                return self.summary
+
+            manager = self.get_manager()
+            with manager.session(self.keep_warm):
+                self.log("Site yüklendi, işlem başlatılıyor...")
+
+                if product_codes is not None:
+                    if self.options.use_index:
+                        self.load_index(manager)
+                    self.run_product_codes(manager, product_codes)
+                else:
+                    self.run_all_orders(manager)
+
+                self.report_error_check_bytes()
+                self.log("\nTüm işlemler tamamlandı.")
+
+        except Exception as e:
+            self.summary.error = str(e)
+            self.log(f"Genel hata: {e}")
+
+        finally:
+            self.summary.stopped = not self.is_running
+            self.summary.circuit_trips = self.rate.total_trips
+            self.is_running = False
+            if self.work_queue:
+                self.finish_queue()
+            self.summary.duration_seconds = round(time.perf_counter() - started, 3)
+            self.write_metrics()
+            self.close_error_log()
+            if not self.keep_warm:
+                self.sessions.clear()
+
+        return self.summary
+
+    def report_error_check_bytes(self):
+        transferred = sum(
+            self.sessions[name].error_detector.bytes_transferred - baseline
+            for name, baseline in self.error_baselines.items()
+            if name in self.sessions
+        )
+        self.summary.error_check_bytes = transferred
+        self.log(f"Hata sayfası kontrolü: {transferred / 1024:.1f} KB aktarıldı.")
+
+    def close_error_log(self):
+        diagnostics = self.error_logger.diagnostics
+        try:
+            self.error_logger.close()
+        except OSError as e:
+            self.log(f"Hata dosyası kapatılamadı: {e}")
+        if diagnostics is None:
+            return
+        if diagnostics.artifacts:
+            self.log(f"Hata tanı kayıtları: {diagnostics.directory}")
+        if diagnostics.dropped:
+            self.log(
+                f"{diagnostics.dropped} hata tanı kaydı, kuyruk dolu olduğu için atlandı."
+            )
+
+    def write_metrics(self):
+        report = self.metrics.report(self.summary.to_dict())
+        tuner = self.metrics.tuner
+        if tuner:
+            report["timeouts"] = tuner.snapshot()
+            for name, timeouts in sorted(tuner.timeouts.items()):
+                self.log(
+                    f"Bekleme {name}: {timeouts} kez zaman aşımı, süre "
+                    f"{report['timeouts'][name]['timeout']:.1f} sn'ye genişletildi"
+                )
+            try:
+                tuner.save()
+            except OSError as e:
+                self.log(f"Gecikme geçmişi yazılamadı: {e}")
+        for name, step in sorted(
+            report["steps"].items(), key=lambda item: -item[1]["total_seconds"]
+        ):
+            self.log(
+                f"Adım {name}: {step['count']} kez, p50 {step['p50']:.2f} sn, "
+                f"p95 {step['p95']:.2f} sn, p99 {step['p99']:.2f} sn, "
+                f"{step['failures']} hata"
+            )
+        try:
+            if self.config.METRICS_FILE:
+                self.metrics.write_json(self.config.METRICS_FILE, report)
+            if self.config.METRICS_PROMETHEUS_FILE:
+                self.metrics.write_prometheus(
+                    self.config.METRICS_PROMETHEUS_FILE, report
+                )
+        except OSError as e:
+            self.log(f"Metrik dosyası yazılamadı: {e}")
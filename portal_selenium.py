@@ -0,0 +1,905 @@
+import base64
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from portal_core import (
+    BasePortalManager,
+    Config,
+    ErrorLogger,
+    GridColumns,
+    GridRow,
+    PortalPage,
+    RowCriteria,
+    StepMetrics,
+    config,
+)
+
+
+def get_chrome_options(
+    headless: bool = False,
+    profile_dir: str = "",
+    capture_network: bool = False,
+    config: Config = config,
+) -> Options:
+    options = Options()
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if profile_dir:
+        profile_dir = os.path.abspath(profile_dir)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
+        options.add_argument(f"--disk-cache-size={config.CHROME_DISK_CACHE_SIZE}")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={config.WINDOW_SIZE}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+    options.add_argument("--log-level=3")
+    options.add_argument("--disable-logging")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_experimental_option(
+        "excludeSwitches", ["enable-logging", "enable-automation"]
+    )
+    options.add_experimental_option("useAutomationExtension", False)
+    return options
+
+
+def get_chrome_service() -> Service:
+    return Service(log_path=os.devnull)
+
+
+class PortalWaiter:
+
+    CLICK_SCRIPT = """
+        if (!window.__pcRequests) {
+            var state = {started: 0, pending: 0};
+            var send = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function () {
+                state.started++;
+                state.pending++;
+                this.addEventListener("loadend", function () { state.pending--; });
+                return send.apply(this, arguments);
+            };
+            window.__pcRequests = state;
+        }
+        var token = window.__pcRequests.started;
+        if (arguments[0]) { arguments[0].click(); }
+        return token;
+    """
+
+    IDLE_SCRIPT = """
+        if (arguments[0] && !arguments[0].isConnected) { return -1; }
+        if (document.readyState !== "complete") { return null; }
+        var state = window.__pcRequests;
+        if (state && state.pending > 0) { return null; }
+        var grid = window.gridViewurnerede;
+        if (grid && grid.InCallback && grid.InCallback()) { return null; }
+        var panel = document.getElementById("gridViewurnerede_LPV");
+        if (panel && panel.offsetParent !== null) { return null; }
+        return state ? state.started : -1;
+    """
+
+    def __init__(self, driver: webdriver.Chrome, config: Config):
+        self.driver = driver
+        self.config = config
+
+    def click(self, element=None) -> int:
+        return self.driver.execute_script(self.CLICK_SCRIPT, element)
+
+    def arm(self) -> int:
+        return self.click(None)
+
+    def waiting(
+        self, timeout: Optional[float] = None, poll_interval: Optional[float] = None
+    ) -> WebDriverWait:
+        return WebDriverWait(
+            self.driver,
+            timeout or self.config.WAIT_TIMEOUT,
+            poll_frequency=poll_interval or self.config.POLL_INTERVAL,
+        )
+
+    def settle(
+        self,
+        token: int,
+        element=None,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ) -> Optional[bool]:
+        quiet_deadline = time.monotonic() + self.config.SETTLE_QUIET_PERIOD
+        watched = [element]
+
+        def settled(driver):
+            try:
+                started = driver.execute_script(self.IDLE_SCRIPT, watched[0])
+            except StaleElementReferenceException:
+                watched[0] = None
+                return False
+            except WebDriverException:
+                return False
+
+            if started is None:
+                return False
+            if started == -1 or started > token:
+                return "finished"
+            return "quiet" if time.monotonic() >= quiet_deadline else False
+
+        try:
+            return self.waiting(timeout, poll_interval).until(settled) == "finished"
+        except TimeoutException:
+            return None
+
+    def wait_for_new_window(
+        self,
+        handles_before: set,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ) -> str:
+        self.waiting(timeout, poll_interval).until(
+            lambda driver: set(driver.window_handles) - handles_before
+        )
+        return (set(self.driver.window_handles) - handles_before).pop()
+
+    def wait_for_document_ready(
+        self, timeout: Optional[float] = None, poll_interval: Optional[float] = None
+    ):
+        self.waiting(timeout, poll_interval).until(
+            lambda driver: driver.execute_script("return document.readyState")
+            == "complete"
+        )
+
+
+class GridReader:
+
+    SNAPSHOT_SCRIPT = """
+        var columns = arguments[0];
+        var rows = document.querySelectorAll('tr[id^="gridViewurnerede_DXDataRow"]');
+        var records = [];
+        for (var i = 0; i < rows.length; i++) {
+            var cells = rows[i].cells;
+            var text = function (index) {
+                return cells[index] ? cells[index].innerText.trim() : "";
+            };
+            var link = cells[columns.link] ? cells[columns.link].querySelector("a") : null;
+            records.push([
+                rows[i].id,
+                cells.length,
+                text(columns.workOrder),
+                text(columns.status),
+                text(columns.date),
+                link ? link.getAttribute("href") || "" : ""
+            ]);
+        }
+        return records;
+    """
+
+    HEADERS_SCRIPT = """
+        var row = document.getElementById("gridViewurnerede_DXHeadersRow0");
+        if (!row) { return []; }
+        var headers = [];
+        for (var i = 0; i < row.cells.length; i++) {
+            headers.push(row.cells[i].innerText.trim());
+        }
+        return headers;
+    """
+
+    LINK_SCRIPT = """
+        var rowId = arguments[0], workOrder = arguments[1], columns = arguments[2];
+        var matches = function (row) {
+            var cell = row && row.cells[columns.workOrder];
+            return cell && cell.innerText.trim() === workOrder;
+        };
+        var row = document.getElementById(rowId);
+        if (!matches(row)) {
+            row = null;
+            var rows = document.querySelectorAll('tr[id^="gridViewurnerede_DXDataRow"]');
+            for (var i = 0; i < rows.length && !row; i++) {
+                if (matches(rows[i])) { row = rows[i]; }
+            }
+        }
+        var cell = row && row.cells[columns.link];
+        return cell ? cell.querySelector("a") : null;
+    """
+
+    APPLY_FILTER_SCRIPT = """
+        var grid = window.gridViewurnerede;
+        if (!grid || !grid.ApplyFilter || !grid.GetColumn) { return null; }
+        var fieldOf = function (editorId) {
+            var match = /col(\\d+)_I$/.exec(editorId || "");
+            var column = match ? grid.GetColumn(parseInt(match[1], 10)) : null;
+            return column ? column.fieldName : null;
+        };
+        var statuses = arguments[0], startDate = arguments[2], endDate = arguments[3];
+        var parts = [];
+        if (statuses.length) {
+            var statusField = fieldOf(arguments[1]);
+            if (!statusField) { return null; }
+            var terms = statuses.map(function (status) {
+                return "[" + statusField + "] = '" + status.replace(/'/g, "''") + "'";
+            });
+            parts.push(terms.length > 1 ? "(" + terms.join(" Or ") + ")" : terms[0]);
+        }
+        if (startDate || endDate) {
+            var dateField = fieldOf(arguments[4]);
+            if (!dateField) { return null; }
+            if (startDate) { parts.push("[" + dateField + "] >= #" + startDate + "#"); }
+            if (endDate) { parts.push("[" + dateField + "] < #" + endDate + "#"); }
+        }
+        var expression = parts.join(" And ");
+        grid.ApplyFilter(expression);
+        return expression;
+    """
+
+    PAGE_SCRIPT = """
+        var grid = window.gridViewurnerede, action = arguments[0];
+        if (!grid || !grid.GetPageIndex || !grid.GetPageCount) { return false; }
+        if (action === "next") {
+            if (!grid.NextPage || grid.GetPageIndex() >= grid.GetPageCount() - 1) {
+                return false;
+            }
+            grid.NextPage();
+            return true;
+        }
+        if (!grid.Refresh) { return false; }
+        grid.Refresh();
+        return true;
+    """
+
+    def __init__(
+        self,
+        driver: webdriver.Chrome,
+        config: Config,
+        detect_columns: Callable[[List[str]], GridColumns],
+    ):
+        self.driver = driver
+        self.config = config
+        self.detect_columns = detect_columns
+        self.column_map: Optional[GridColumns] = None
+
+    def page(self, action: str) -> bool:
+        return bool(self.driver.execute_script(self.PAGE_SCRIPT, action))
+
+    def apply_filter(self, criteria: RowCriteria) -> Optional[str]:
+        start_date, end_date = criteria.date_range or (None, None)
+        return self.driver.execute_script(
+            self.APPLY_FILTER_SCRIPT,
+            list(criteria.statuses),
+            self.config.STATUS_FILTER_EDITOR_ID,
+            start_date.isoformat() if start_date else "",
+            (end_date + timedelta(days=1)).isoformat() if end_date else "",
+            self.config.DATE_FILTER_EDITOR_ID,
+        )
+
+    def columns(self) -> dict:
+        if self.column_map is None:
+            headers = self.driver.execute_script(self.HEADERS_SCRIPT)
+            if not headers:
+                return GridColumns.from_config(self.config).to_script()
+            self.column_map = self.detect_columns(headers)
+        return self.column_map.to_script()
+
+    def snapshot(self) -> List[GridRow]:
+        records = self.driver.execute_script(self.SNAPSHOT_SCRIPT, self.columns())
+        return [GridRow(*record) for record in records or []]
+
+    def find_link(self, row: GridRow):
+        return self.driver.execute_script(
+            self.LINK_SCRIPT, row.row_id, row.work_order, self.columns()
+        )
+
+    def parse(self, page: PortalPage) -> List[GridRow]:
+        if self.column_map is None and page.headers:
+            self.column_map = self.detect_columns(page.headers)
+        elif self.column_map is None:
+            self.columns()
+        return page.grid_rows(self.column_map or GridColumns.from_config(self.config))
+
+
+class GridCapture:
+
+    RESPONSE_TYPES = {"Document", "XHR", "Fetch"}
+    GRID_IDS = {"gridViewurnerede_DXMainTable", "gridViewurnerede_DXEmptyRow"}
+    JS_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+    JS_CHARACTERS = {"n": "\n", "r": "\r", "t": "\t", "b": "\b", "f": "\f"}
+
+    def __init__(self, driver: webdriver.Chrome, grid: GridReader):
+        self.driver = driver
+        self.grid = grid
+        self.grid_path = ""
+        self.responses: Dict[str, tuple[str, int]] = {}
+        self.rows: Optional[List[GridRow]] = None
+
+    def enable(self, url: str):
+        self.grid_path = urlparse(url).path.lower()
+        self.driver.execute_cdp_cmd("Network.enable", {})
+
+    def clear(self):
+        self.driver.get_log("performance")
+        self.responses.clear()
+        self.rows = None
+
+    def take(self) -> Optional[List[GridRow]]:
+        rows, self.rows = self.rows, None
+        return rows
+
+    def poll(self) -> bool:
+        for entry in self.driver.get_log("performance"):
+            event = json.loads(entry["message"])["message"]
+            params = event.get("params", {})
+            if event.get("method") == "Network.responseReceived":
+                response = params.get("response", {})
+                if (
+                    params.get("type") in self.RESPONSE_TYPES
+                    and urlparse(response.get("url", "")).path.lower() == self.grid_path
+                ):
+                    self.responses[params["requestId"]] = (
+                        response["url"],
+                        int(response.get("status", 200)),
+                    )
+            elif (
+                event.get("method") == "Network.loadingFinished"
+                and params.get("requestId") in self.responses
+            ):
+                page = self.read(params["requestId"])
+                if page is not None:
+                    self.rows = self.grid.parse(page)
+        return self.rows is not None
+
+    def read(self, request_id: str) -> Optional[PortalPage]:
+        url, status = self.responses.pop(request_id)
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except WebDriverException:
+            return None
+
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", "replace")
+        if not body.lstrip().startswith("<"):
+            body = self.JS_ESCAPE.sub(self.unescape, body)
+        page = PortalPage(url, status, body)
+        if page.headers or page.rows or self.GRID_IDS & page.ids:
+            return page
+        return None
+
+    @classmethod
+    def unescape(cls, match: re.Match) -> str:
+        code = match.group(1)
+        if len(code) > 1:
+            return chr(int(code[1:], 16))
+        return cls.JS_CHARACTERS.get(code, code)
+
+
+class WebDriverManager(BasePortalManager):
+
+    DOM_EXCERPT_SCRIPT = """
+        var root = document.documentElement;
+        return root ? root.outerHTML.slice(0, arguments[0]) : "";
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        log_callback: Optional[Callable[[str], None]] = None,
+        name: str = "",
+        error_logger: Optional[ErrorLogger] = None,
+        metrics: Optional[StepMetrics] = None,
+    ):
+        super().__init__(config, log_callback, name, error_logger, metrics)
+        self.driver: Optional[webdriver.Chrome] = None
+        self.waiter: Optional[PortalWaiter] = None
+        self.grid: Optional[GridReader] = None
+        self.grid_handle: Optional[str] = None
+        self.worker_handle: Optional[str] = None
+        self.pending_search: Optional[tuple] = None
+        self.capture: Optional[GridCapture] = None
+        self.captured_rows: Optional[List[GridRow]] = None
+        self.grid_url = ""
+
+    def block_resources(self):
+        if not (self.config.HEADLESS and self.config.BLOCKED_URL_PATTERNS):
+            return
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": self.config.BLOCKED_URL_PATTERNS}
+            )
+        except WebDriverException as e:
+            self.log(f"Kaynak engelleme etkinleştirilemedi: {e}")
+
+    def profile_dir(self) -> str:
+        if not self.config.CHROME_PROFILE_DIR:
+            return ""
+        return os.path.join(self.config.CHROME_PROFILE_DIR, self.name or "main")
+
+    def start_driver(self):
+        with self.metrics.step("driver_start"):
+            self.driver = webdriver.Chrome(
+                service=get_chrome_service(),
+                options=get_chrome_options(
+                    self.config.HEADLESS,
+                    self.profile_dir(),
+                    self.config.GRID_CAPTURE,
+                    self.config,
+                ),
+            )
+            self.block_resources()
+        self.waiter = PortalWaiter(self.driver, self.config)
+        self.grid = GridReader(self.driver, self.config, self.detect_columns)
+        self.capture = (
+            GridCapture(self.driver, self.grid) if self.config.GRID_CAPTURE else None
+        )
+        self.grid_handle = self.driver.current_window_handle
+        self.worker_handle = None
+        self.items_since_start = 0
+
+    def quit_driver(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+        self.driver = None
+        self.worker_handle = None
+
+    def is_alive(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            return self.grid_handle in self.driver.window_handles
+        except WebDriverException:
+            return False
+
+    def process_memory(self) -> Optional[int]:
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            browser = psutil.Process(self.driver.service.process.pid)
+            return sum(
+                process.memory_info().rss
+                for process in browser.children(recursive=True)
+            )
+        except (psutil.Error, AttributeError):
+            return None
+
+    def heap_memory(self) -> Optional[int]:
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            result = self.driver.execute_cdp_cmd("Performance.getMetrics", {})
+        except WebDriverException:
+            return None
+        metrics = {metric["name"]: metric["value"] for metric in result["metrics"]}
+        return int(metrics.get("JSHeapTotalSize", 0)) or None
+
+    def recycle_reason(self) -> Optional[str]:
+        items = self.items_since_start
+        if self.config.RECYCLE_AFTER_ITEMS and items >= self.config.RECYCLE_AFTER_ITEMS:
+            return f"{items} iş emri işlendi"
+        if not items or items % max(1, self.config.RECYCLE_CHECK_INTERVAL):
+            return None
+
+        rss = self.process_memory() if self.config.RECYCLE_RSS_MB else None
+        if rss and rss >= self.config.RECYCLE_RSS_MB * 1024 * 1024:
+            return f"tarayıcı belleği {rss / 1048576:.0f} MB"
+        if rss is None and self.config.RECYCLE_HEAP_MB:
+            heap = self.heap_memory()
+            if heap and heap >= self.config.RECYCLE_HEAP_MB * 1024 * 1024:
+                return f"JS belleği {heap / 1048576:.0f} MB"
+        return None
+
+    def click(self, element) -> int:
+        if self.config.USE_FIXED_DELAYS:
+            self.driver.execute_script("arguments[0].click();", element)
+            return 0
+        return self.waiter.click(element)
+
+    def settle(self, token: int, fallback_delay: float, element=None, step: str = ""):
+        if self.config.USE_FIXED_DELAYS:
+            time.sleep(fallback_delay)
+        elif step:
+            name = f"{step}_settle"
+            started = time.perf_counter()
+            finished = self.waiter.settle(
+                token, element, self.step_timeout(name), self.step_poll_interval(name)
+            )
+            if finished is not False:
+                self.observe_wait(name, time.perf_counter() - started, bool(finished))
+        else:
+            self.waiter.settle(token, element)
+
+    @contextmanager
+    def timed_wait(self, name: str, optional: bool = False):
+        started = time.perf_counter()
+        try:
+            yield
+        except TimeoutException:
+            if not optional:
+                self.observe_wait(name, time.perf_counter() - started, False)
+            raise
+        self.observe_wait(name, time.perf_counter() - started)
+
+    def wait_for(self, name: str, condition, optional: bool = False):
+        with self.timed_wait(name, optional):
+            return WebDriverWait(
+                self.driver,
+                self.step_timeout(name),
+                poll_frequency=self.step_poll_interval(name),
+            ).until(condition)
+
+    def navigate_to_start_page(self):
+        with self.metrics.step("start_page"):
+            self.load_start_page()
+
+    def load_start_page(self):
+        self.driver.switch_to.window(self.grid_handle)
+        self.driver.get(self.config.START_URL)
+        self.grid.column_map = None
+        self.pending_search = None
+        self.captured_rows = None
+        if self.capture:
+            try:
+                self.capture.enable(self.driver.current_url)
+            except WebDriverException as e:
+                self.log(f"Tablo yanıtı yakalama kapatıldı: {e}")
+                self.capture = None
+        if self.config.USE_FIXED_DELAYS:
+            time.sleep(self.config.PAGE_LOAD_DELAY)
+            return
+
+        try:
+            WebDriverWait(
+                self.driver,
+                self.config.PAGE_LOAD_DELAY,
+                poll_frequency=self.config.POLL_INTERVAL,
+            ).until(
+                EC.presence_of_element_located((By.ID, self.config.SEARCH_EDITOR_ID))
+            )
+        except TimeoutException:
+            return
+        self.waiter.settle(self.waiter.arm())
+        self.grid_url = self.driver.current_url
+
+    def start_grid_filter(self, editor_id: str, value: str, step: str = "search"):
+        editor = self.wait_for(
+            f"{step}_editor", EC.presence_of_element_located((By.ID, editor_id))
+        )
+        token = self.waiter.arm()
+        editor.clear()
+        editor.send_keys(value, Keys.ENTER)
+        return token, editor
+
+    def type_grid_filter(self, editor_id: str, value: str, step: str = "search"):
+        if self.config.USE_FIXED_DELAYS:
+            editor = self.wait_for(
+                f"{step}_editor", EC.presence_of_element_located((By.ID, editor_id))
+            )
+            editor.clear()
+            editor.send_keys(value)
+            time.sleep(self.config.SEARCH_DELAY)
+        else:
+            token, editor = self.start_grid_filter(editor_id, value, step)
+            self.settle(token, self.config.SEARCH_DELAY, editor, step)
+
+    def prefetch_search(self):
+        product_code, self.next_search = self.next_search, None
+        if not product_code or self.config.USE_FIXED_DELAYS:
+            return
+
+        current = self.driver.current_window_handle
+        try:
+            with self.metrics.step("prefetch"):
+                self.driver.switch_to.window(self.grid_handle)
+                if self.capture:
+                    self.capture.clear()
+                try:
+                    token, editor = self.start_grid_filter(
+                        self.config.SEARCH_EDITOR_ID, product_code
+                    )
+                finally:
+                    self.driver.switch_to.window(current)
+            self.pending_search = (product_code, token, editor)
+        except WebDriverException as e:
+            self.log(f"  Sonraki arama önceden başlatılamadı: {e}")
+
+    def search_product(self, product_code: str) -> bool:
+        pending, self.pending_search = self.pending_search, None
+        prefetched = pending is not None and pending[0] == product_code
+        with self.metrics.step("search_prefetched" if prefetched else "search") as step:
+            try:
+                if pending is not None and not (prefetched and self.capture):
+                    _, token, editor = pending
+                    self.settle(token, self.config.SEARCH_DELAY, editor, "search")
+                if not prefetched and self.capture:
+                    self.capture.clear()
+                    self.start_grid_filter(self.config.SEARCH_EDITOR_ID, product_code)
+                elif not prefetched:
+                    self.type_grid_filter(self.config.SEARCH_EDITOR_ID, product_code)
+
+                if not (self.capture and self.wait_for_capture("search")):
+                    self.wait_for(
+                        "search",
+                        EC.presence_of_element_located(
+                            (
+                                By.CSS_SELECTOR,
+                                'tr[id^="gridViewurnerede_DXDataRow"], '
+                                "#gridViewurnerede_DXEmptyRow",
+                            )
+                        ),
+                    )
+
+            except TimeoutException:
+                step.failed = True
+        return not step.failed
+
+    def apply_grid_filters(self, criteria: RowCriteria) -> bool:
+        if not criteria.date_range and not criteria.statuses:
+            return False
+
+        status_filter = criteria.single_status
+        self.captured_rows = None
+        try:
+            token = 0 if self.config.USE_FIXED_DELAYS else self.waiter.arm()
+            expression = self.grid.apply_filter(criteria)
+            if expression is not None:
+                self.log(f"Portal filtresi uygulandı: {expression}")
+                self.settle(token, self.config.SEARCH_DELAY)
+                return True
+
+            if status_filter:
+                self.type_grid_filter(
+                    self.config.STATUS_FILTER_EDITOR_ID, status_filter, "grid_filter"
+                )
+                self.log(f"Portal durum filtresi uygulandı: {status_filter}")
+                return True
+
+        except (TimeoutException, WebDriverException) as e:
+            self.log(
+                f"Portal filtresi uygulanamadı, istemci tarafında filtrelenecek: {e}"
+            )
+
+        return False
+
+    def wait_for_capture(self, step: str) -> bool:
+        try:
+            self.wait_for(
+                f"{step}_capture", lambda driver: self.capture.poll(), optional=True
+            )
+        except TimeoutException:
+            self.log("  Tablo yanıtı yakalanamadı, sayfadan okunuyor.")
+            return False
+        self.captured_rows = self.capture.take()
+        return True
+
+    def snapshot_grid(self) -> List[GridRow]:
+        rows, self.captured_rows = self.captured_rows, None
+        return rows if rows is not None else self.grid.snapshot()
+
+    def move_grid(self, action: str) -> bool:
+        try:
+            tables = self.driver.find_elements(By.ID, "gridViewurnerede_DXMainTable")
+            token = 0 if self.config.USE_FIXED_DELAYS else self.waiter.arm()
+            if self.capture:
+                self.capture.clear()
+            if not self.grid.page(action):
+                return False
+            if not (self.capture and self.wait_for_capture("search")):
+                self.settle(
+                    token, self.config.SEARCH_DELAY, tables[0] if tables else None
+                )
+            return True
+        except WebDriverException as e:
+            self.log(f"Tablo sayfası değiştirilemedi: {e}")
+            return False
+
+    def next_grid_page(self) -> bool:
+        return self.move_grid("next")
+
+    def refresh_grid(self) -> bool:
+        return self.move_grid("refresh")
+
+    def has_error_page(self) -> bool:
+        return self.error_detector.check(self.driver)
+
+    def process_product_row(
+        self, row: GridRow, row_index: int, criteria: Optional[RowCriteria] = None
+    ) -> bool:
+        if not self.passes_filters(row, row_index, criteria):
+            return False
+
+        self.row_started = time.perf_counter()
+        with self.metrics.step("row") as step:
+            step.failed = not self.open_product_row(row, row_index)
+        return not step.failed
+
+    def failure_artifacts(self) -> tuple[str, Dict[str, bytes]]:
+        excerpt = self.driver.execute_script(
+            self.DOM_EXCERPT_SCRIPT, self.config.DIAGNOSTICS_DOM_CHARS
+        )
+        artifacts = {"dom.html": (excerpt or "").encode("utf-8")}
+        if self.config.DIAGNOSTICS_SCREENSHOT:
+            artifacts["screen.png"] = self.driver.get_screenshot_as_png()
+        return self.driver.current_url, artifacts
+
+    def product_url(self, row: GridRow) -> Optional[str]:
+        href = row.href.strip()
+        if not href or href.startswith(("#", "javascript:")):
+            return None
+        return urljoin(self.grid_url or self.config.START_URL, href)
+
+    def opens_without_grid(self, row: GridRow) -> bool:
+        return self.config.REUSE_WORKER_TAB and self.product_url(row) is not None
+
+    def open_in_worker_tab(self, url: str):
+        if self.worker_handle not in self.driver.window_handles:
+            self.driver.switch_to.new_window("tab")
+            self.worker_handle = self.driver.current_window_handle
+            self.block_resources()
+        else:
+            self.driver.switch_to.window(self.worker_handle)
+        self.driver.get(url)
+
+    def open_in_popup(self, row: GridRow) -> bool:
+        if self.capture:
+            try:
+                link = self.wait_for(
+                    "open_page_link", lambda driver: self.grid.find_link(row)
+                )
+            except TimeoutException:
+                link = None
+        else:
+            link = self.grid.find_link(row)
+        if link is None:
+            return False
+
+        if self.config.USE_FIXED_DELAYS:
+            handles_before = set(self.driver.window_handles)
+            self.driver.execute_script("arguments[0].click();", link)
+            time.sleep(self.config.CLICK_DELAY)
+            new_handles = set(self.driver.window_handles) - handles_before
+            if not new_handles:
+                return False
+            self.driver.switch_to.window(new_handles.pop())
+        else:
+            handles_before = set(self.driver.window_handles)
+            self.waiter.click(link)
+            with self.timed_wait("open_page_window"):
+                handle = self.waiter.wait_for_new_window(
+                    handles_before,
+                    self.step_timeout("open_page_window"),
+                    self.step_poll_interval("open_page_window"),
+                )
+            self.driver.switch_to.window(handle)
+            self.block_resources()
+            with self.timed_wait("open_page_ready"):
+                self.waiter.wait_for_document_ready(
+                    self.step_timeout("open_page_ready"),
+                    self.step_poll_interval("open_page_ready"),
+                )
+        return True
+
+    def return_to_grid(self):
+        keep = {self.grid_handle, self.worker_handle}
+        for handle in self.driver.window_handles:
+            if handle not in keep:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        if self.worker_handle not in self.driver.window_handles:
+            self.worker_handle = None
+        self.driver.switch_to.window(self.grid_handle)
+
+    def open_product_row(self, row: GridRow, row_index: int) -> bool:
+        try:
+            work_order = row.work_order
+            url = self.product_url(row) if self.config.REUSE_WORKER_TAB else None
+
+            with self.metrics.step("open_page") as step:
+                if url:
+                    self.open_in_worker_tab(url)
+                else:
+                    step.failed = not self.open_in_popup(row)
+            if step.failed:
+                return False
+
+            with self.metrics.step("error_check") as step:
+                step.failed = self.has_error_page()
+            if step.failed:
+                self.report_failure(work_order, "error_check")
+                return False
+
+            return self.process_product_page(work_order, row_index)
+
+        except Exception:
+            return False
+
+        finally:
+            try:
+                self.return_to_grid()
+            except WebDriverException as e:
+                self.log(f"  Pencere düzenlenemedi: {e}")
+
+    def process_product_page(self, work_order: str, row_index: int) -> bool:
+        try:
+            with self.metrics.step("read_quantity"):
+                quantity_input = self.wait_for(
+                    "read_quantity", EC.presence_of_element_located((By.ID, "Miktar_I"))
+                )
+                quantity = quantity_input.get_attribute("value")
+
+            with self.metrics.step("baslat"):
+                try:
+                    start1 = self.wait_for(
+                        "baslat",
+                        EC.element_to_be_clickable((By.ID, "Baslat")),
+                        optional=True,
+                    )
+                    token = self.click(start1)
+                    self.settle(token, self.config.CLICK_DELAY, start1, "baslat")
+
+                    start2 = self.wait_for(
+                        "baslat_confirm",
+                        EC.element_to_be_clickable((By.ID, "btnUpdatebaslat")),
+                    )
+                    token = self.click(start2)
+                    self.settle(
+                        token, self.config.UPDATE_DELAY, start2, "baslat_confirm"
+                    )
+                except TimeoutException:
+                    pass
+
+            with self.metrics.step("bitir"):
+                finish = self.wait_for(
+                    "bitir", EC.element_to_be_clickable((By.ID, "Bitir"))
+                )
+                token = self.click(finish)
+                self.settle(token, self.config.CLICK_DELAY, finish, "bitir")
+
+            with self.metrics.step("brut"):
+                brut_input = self.wait_for(
+                    "brut", EC.presence_of_element_located((By.ID, "Brut_I"))
+                )
+                token = 0 if self.config.USE_FIXED_DELAYS else self.waiter.arm()
+                brut_input.clear()
+                brut_input.send_keys(quantity)
+                self.settle(token, self.config.CLICK_DELAY, step="brut")
+
+            with self.metrics.step("update"):
+                add_button = self.wait_for(
+                    "update", EC.element_to_be_clickable((By.ID, "btnUpdate_CD"))
+                )
+                token = self.click(add_button)
+                self.prefetch_search()
+                self.settle(token, self.config.UPDATE_DELAY, add_button, "update")
+
+            return True
+
+        except TimeoutException as e:
+            self.report_failure(work_order, error=e)
+            return False
+        except Exception:
+            return False
@@ -0,0 +1,282 @@
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+from cli import EXIT_FATAL, summary_exit_code
+from mock_portal import GRID_PATH, create_server
+from portal_core import (
+    BatchRunner,
+    CheckpointJournal,
+    HttpPortalManager,
+    RateController,
+    RunOptions,
+    SharedWorkQueue,
+    config,
+)
+
+
+@pytest.fixture
+def portal():
+    server = create_server(order_count=45, seed=1, page_size=10)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def portal_config(tmp_path, start_url: str, **overrides):
+    run_config = replace(
+        config,
+        ENGINE="http",
+        SEARCH_DELAY=0,
+        ERROR_FILE=str(tmp_path / "errors.txt"),
+        JOURNAL_FILE=str(tmp_path / "journal.db"),
+        LOG_FILE=str(tmp_path / "portal.log"),
+        METRICS_FILE="",
+        METRICS_PROMETHEUS_FILE="",
+        LATENCY_FILE="",
+        DIAGNOSTICS_DIR="",
+        **overrides,
+    )
+    run_config.START_URL = start_url
+    return run_config
+
+
+def run_batch(tmp_path, portal, options: RunOptions, **overrides):
+    start_url = f"http://127.0.0.1:{portal.server_port}{GRID_PATH}"
+    runner = BatchRunner(
+        portal_config(tmp_path, start_url, **overrides), options, lambda text: None
+    )
+    return runner.run()
+
+
+def statuses(portal) -> dict:
+    counts = {}
+    for order in portal.state.orders.values():
+        counts[order["status"]] = counts.get(order["status"], 0) + 1
+    return counts
+
+
+def test_all_orders_pages_through_status_filtered_grid(tmp_path, portal):
+    summary = run_batch(
+        tmp_path, portal, RunOptions(status_filter="HAZIRLIK", resume=False)
+    )
+
+    assert summary.error is None
+    assert (summary.total, summary.succeeded, summary.failed) == (15, 15, 0)
+    assert statuses(portal) == {"TAMAMLANDI": 15, "ÜRETİM": 15, "KONTROL": 15}
+
+
+def test_product_codes_report_unknown_code_as_not_found(tmp_path, portal):
+    summary = run_batch(
+        tmp_path, portal, RunOptions(product_codes=["WO00001", "NOPE2"], resume=False)
+    )
+
+    assert (summary.succeeded, summary.not_found, summary.failed) == (1, 1, 0)
+    journal = CheckpointJournal(str(tmp_path / "journal.db"))
+    assert journal.outcomes[("code", "NOPE2")] == CheckpointJournal.NOT_FOUND
+    journal.close()
+
+
+def test_index_resolves_codes_and_reports_misses(tmp_path, portal):
+    summary = run_batch(
+        tmp_path,
+        portal,
+        RunOptions(
+            product_codes=["WO00003", "WO00041", "MISSING1"],
+            use_index=True,
+            resume=False,
+        ),
+    )
+
+    assert (summary.succeeded, summary.not_found, summary.failed) == (2, 1, 0)
+    assert portal.state.orders["WO00041"]["status"] == "TAMAMLANDI"
+
+
+def test_lost_session_is_restarted_and_code_retried(tmp_path, portal, monkeypatch):
+    search_product = HttpPortalManager.search_product
+    restart = HttpPortalManager.restart
+    restarts = []
+
+    def search_once_lost(manager, product_code):
+        if product_code == "WO00002" and not restarts:
+            manager.quit_driver()
+            raise ConnectionError("session lost")
+        return search_product(manager, product_code)
+
+    def counted_restart(manager):
+        restarts.append(manager.name)
+        restart(manager)
+
+    monkeypatch.setattr(HttpPortalManager, "search_product", search_once_lost)
+    monkeypatch.setattr(HttpPortalManager, "restart", counted_restart)
+    monkeypatch.setattr(RateController, "backoff", lambda rate, attempt: 0.0)
+    summary = run_batch(
+        tmp_path,
+        portal,
+        RunOptions(product_codes=["WO00001", "WO00002", "WO00003"], resume=False),
+    )
+
+    assert summary.error is None
+    assert (summary.succeeded, summary.failed) == (3, 0)
+    assert len(restarts) == 1
+
+
+def test_worker_pool_processes_codes(tmp_path, portal):
+    codes = [f"WO{index:05d}" for index in range(1, 9)]
+    summary = run_batch(
+        tmp_path, portal, RunOptions(product_codes=codes, worker_count=3, resume=False)
+    )
+
+    assert summary.error is None
+    assert summary.succeeded == len(codes)
+
+
+def test_worker_pool_reports_error_check_bytes(tmp_path, portal, monkeypatch):
+    checks = []
+    has_error_page = HttpPortalManager.has_error_page
+
+    def counted_check(manager):
+        checks.append(manager.name)
+        manager.error_detector.count_bytes("x" * 100)
+        return has_error_page(manager)
+
+    monkeypatch.setattr(HttpPortalManager, "has_error_page", counted_check)
+    codes = [f"WO{index:05d}" for index in range(1, 7)]
+    summary = run_batch(
+        tmp_path, portal, RunOptions(product_codes=codes, worker_count=2, resume=False)
+    )
+
+    assert len(set(checks)) == 2
+    assert summary.error_check_bytes == 100 * len(checks)
+
+
+def test_worker_pool_records_item_that_raised(tmp_path, portal, monkeypatch):
+    process_product_code = BatchRunner.process_product_code
+
+    def process_or_raise(runner, manager, index, product_code):
+        if product_code == "WO00004":
+            raise RuntimeError("journal locked")
+        return process_product_code(runner, manager, index, product_code)
+
+    monkeypatch.setattr(BatchRunner, "process_product_code", process_or_raise)
+    codes = [f"WO{index:05d}" for index in range(1, 7)]
+    summary = run_batch(
+        tmp_path, portal, RunOptions(product_codes=codes, worker_count=2, resume=False)
+    )
+
+    assert summary.error is None
+    assert (summary.total, summary.succeeded, summary.failed) == (6, 5, 1)
+    journal = CheckpointJournal(str(tmp_path / "journal.db"))
+    assert journal.failed_items("code") == ["WO00004"]
+    journal.close()
+
+
+def test_worker_pool_reports_sessions_that_never_started(tmp_path):
+    runner = BatchRunner(
+        portal_config(tmp_path, f"http://127.0.0.1:9{GRID_PATH}"),
+        RunOptions(product_codes=["WO00001", "WO00002"], worker_count=2, resume=False),
+        lambda text: None,
+    )
+    summary = runner.run()
+
+    assert summary.error
+    assert summary_exit_code(summary) == EXIT_FATAL
+
+
+def test_queue_run_records_outcomes(tmp_path, portal):
+    queue_file = str(tmp_path / "queue.db")
+    summary = run_batch(
+        tmp_path,
+        portal,
+        RunOptions(
+            product_codes=["WO00002", "WO00005", "NOPE3"],
+            queue_file=queue_file,
+            resume=False,
+        ),
+        QUEUE_OWNER="bench-1",
+    )
+
+    assert summary.queue["states"] == {
+        CheckpointJournal.DONE: 2,
+        CheckpointJournal.NOT_FOUND: 1,
+    }
+    assert summary.queue["machines"] == {
+        "bench-1": {CheckpointJournal.DONE: 2, CheckpointJournal.NOT_FOUND: 1}
+    }
+    assert summary.queue["failed"] == ["NOPE3"]
+
+
+def test_queue_expired_lease_moves_to_next_machine(tmp_path):
+    queue_file = str(tmp_path / "queue.db")
+    first = SharedWorkQueue(queue_file, "first", lease_seconds=0.2)
+    assert first.add(["A", "B", "A"]) == 2
+    assert first.claim(1) == ["A"]
+    first.close()
+
+    second = SharedWorkQueue(queue_file, "second", lease_seconds=0.2)
+    assert second.claim(5) == ["B"]
+    time.sleep(0.3)
+    assert second.claim(5) == ["A"]
+    assert second.reclaimed == 1
+
+    restarted = SharedWorkQueue(queue_file, "first", lease_seconds=0.2)
+    assert not restarted.complete("A", CheckpointJournal.DONE)
+    assert restarted.lost == 1
+    restarted.close()
+
+    assert second.complete("A", CheckpointJournal.DONE, "WO1")
+    assert second.complete("B", CheckpointJournal.FAILED)
+    report = second.report()
+    second.close()
+
+    assert report["states"] == {CheckpointJournal.DONE: 1, CheckpointJournal.FAILED: 1}
+    assert report["failed"] == ["B"]
+
+
+def test_rate_controller_trips_and_recovers_through_half_open():
+    rate = RateController(
+        replace(
+            config,
+            CIRCUIT_WINDOW=4,
+            CIRCUIT_MIN_SAMPLES=2,
+            CIRCUIT_COOLDOWN=0.1,
+            RATE_MAX_INTERVAL=0.0,
+        ),
+        max_concurrency=2,
+        log_callback=lambda text: None,
+    )
+
+    for _ in range(2):
+        assert rate.acquire(lambda: True)
+        rate.release(False, 0.0, server_error=True)
+    assert rate.total_trips == 1
+    assert not rate.relaxed()
+    assert not rate.acquire(lambda: False)
+
+    assert rate.acquire(lambda: True)
+    assert rate.half_open and rate.limit == 1
+    rate.release(False, 0.0, server_error=True)
+    assert rate.total_trips == 2 and rate.trips == 2
+
+    assert rate.acquire(lambda: True)
+    rate.release(True, 0.0, server_error=False)
+    assert not rate.half_open and rate.trips == 0
+    assert rate.relaxed()
+
+
+def test_rate_controller_recovers_from_full_backoff_quickly():
+    rate = RateController(
+        replace(config, CIRCUIT_MIN_SAMPLES=100), log_callback=lambda text: None
+    )
+    for _ in range(10):
+        rate.slow_down()
+    assert rate.interval == config.RATE_MAX_INTERVAL
+
+    successes = 0
+    while rate.interval > config.RATE_MIN_INTERVAL:
+        rate.speed_up()
+        successes += 1
+    assert successes <= 15